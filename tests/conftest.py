@@ -1,4 +1,8 @@
 import os
+import shutil
+import tempfile
+
+import pytest
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 root_dir_content = os.listdir(BASE_DIR)
@@ -23,6 +27,7 @@ if FILENAME not in project_dir_content:
         f'Убедитесь, что у вас верная структура проекта.'
     )
 
+from django.test import override_settings
 from django.utils.version import get_version
 
 assert get_version() < '3.0.0', 'Пожалуйста, используйте версию Django < 3.0.0'
@@ -37,3 +42,13 @@ pytest_plugins = [
     'tests.fixtures.fixture_user',
     'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(scope='session', autouse=True)
+def temp_media_root():
+    # mixer заполняет Post.image, а миниатюры пишутся сразу: не сорим
+    # в настоящий MEDIA_ROOT репозитория
+    media_root = tempfile.mkdtemp()
+    with override_settings(MEDIA_ROOT=media_root):
+        yield media_root
+    shutil.rmtree(media_root, ignore_errors=True)
@@ -1,7 +1,42 @@
+import threading
+import time
 from datetime import datetime
 
 
+class ExpiringValue:
+    """Значение func(), общее для процесса, до момента expires_at.
+
+    expires_at(value) возвращает timestamp, после которого значение надо
+    пересчитать. Подходит для данных, которые меняются по календарю,
+    а не от запроса к запросу: проверка срока - одно сравнение чисел.
+    """
+
+    def __init__(self, func, expires_at):
+        self.func = func
+        self.expires_at = expires_at
+        self.lock = threading.Lock()
+        self.value = None
+        self.expires = float('-inf')
+
+    def get(self, now=None):
+        now = time.time() if now is None else now
+        if now >= self.expires:
+            with self.lock:
+                if now >= self.expires:
+                    self.value = self.func()
+                    self.expires = self.expires_at(self.value)
+        return self.value
+
+
+def next_year_start(year):
+    return datetime(year + 1, 1, 1).timestamp()
+
+
+# год меняется раз в году: считаем его один раз до 1 января
+current_year = ExpiringValue(lambda: datetime.now().year, next_year_start)
+
+
 def year(request):
     return {
-        'year': datetime.now().year,
+        'year': current_year.get(),
     }
@@ -0,0 +1,93 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post
+
+# прежняя схема: сессия и пользователь читаются из базы на каждый запрос
+DB_AUTH = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает число SQL-запросов и медианное время страниц posts '
+        'для вошедшего пользователя: сессии и request.user из базы '
+        'против cached_db-сессий и users.backends.CachedModelBackend'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        post = Post.objects.select_related('group').order_by(
+            '-pub_date', '-id'
+        ).first()
+        if post is None:
+            raise CommandError('Нет данных, сначала запустите seed_benchmark')
+        urls = {
+            'index': reverse('posts:index'),
+            'profile': reverse('posts:profile', args=[post.author.username]),
+            'post_detail': reverse('posts:post_detail', args=[post.pk]),
+            'follow_index': reverse('posts:follow_index'),
+        }
+        if post.group is not None:
+            urls['group_list'] = reverse(
+                'posts:group_list', args=[post.group.slug]
+            )
+        modes = (
+            ('db', DB_AUTH),
+            ('cached', {
+                'SESSION_ENGINE': settings.SESSION_ENGINE,
+                'AUTHENTICATION_BACKENDS': settings.AUTHENTICATION_BACKENDS,
+            }),
+        )
+        results = {}
+        for mode, overrides in modes:
+            with override_settings(**overrides):
+                # клиент создаётся заново: SessionMiddleware запоминает
+                # SESSION_ENGINE при загрузке
+                client = Client()
+                client.force_login(post.author)
+                for name, url in urls.items():
+                    results[mode, name] = self.measure(
+                        client, url, options['repeat']
+                    )
+        total_saved = 0
+        for name in urls:
+            db_queries, db_ms = results['db', name]
+            cached_queries, cached_ms = results['cached', name]
+            total_saved += db_queries - cached_queries
+            self.stdout.write(
+                '{:<13} запросов {:>2} -> {:>2} (-{})  '
+                '{:8.3f} мс -> {:8.3f} мс'.format(
+                    name, db_queries, cached_queries,
+                    db_queries - cached_queries, db_ms, cached_ms
+                )
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'В среднем экономится {:.1f} запроса на запрос '
+            'вошедшего пользователя'.format(total_saved / len(urls))
+        ))
+
+    def measure(self, client, url, repeat):
+        # первый запрос прогревает кэш сессии, пользователя и лент
+        client.get(url)
+        with CaptureQueriesContext(connection) as captured:
+            client.get(url)
+        # считаем сразу: request_started следующего запроса чистит лог
+        queries = len(captured)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        return queries, statistics.median(timings)
@@ -0,0 +1,97 @@
+import copy
+import statistics
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import Client, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+CACHED_YEAR = 'core.context_processors.year.year'
+EAGER_YEAR = 'core.management.commands.benchmark_context.eager_year'
+
+PAGES = ('about:author', 'about:tech', 'posts:index', 'admin:login')
+
+
+def eager_year(request):
+    # прежний вариант: год считается на каждый рендер, нужен он или нет
+    return {'year': datetime.now().year}
+
+
+def eager_templates():
+    templates = copy.deepcopy(settings.TEMPLATES)
+    for engine in templates:
+        processors = engine.get('OPTIONS', {}).get('context_processors', [])
+        engine['OPTIONS']['context_processors'] = [
+            EAGER_YEAR if path == CACHED_YEAR else path for path in processors
+        ]
+    return templates
+
+
+def processor_paths(templates):
+    return templates[0].get('OPTIONS', {}).get('context_processors', [])
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время context processors и медианное время рендера '
+        'страниц about, posts и админки с кэшируемым годом и с годом, '
+        'вычисляемым на каждый запрос'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        modes = (
+            ('eager', eager_templates()),
+            ('cached', settings.TEMPLATES),
+        )
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        for mode, templates in modes:
+            self.stdout.write('{:<14} {:<6} {:8.3f} мкс на рендер'.format(
+                'processors', mode,
+                self.measure_processors(
+                    processor_paths(templates), request,
+                    options['repeat'] * 100
+                )
+            ))
+        results = {}
+        for mode, templates in modes:
+            with override_settings(TEMPLATES=templates):
+                client = Client()
+                for name in PAGES:
+                    results[mode, name] = self.measure(
+                        client, reverse(name), options['repeat']
+                    )
+        for name in PAGES:
+            eager = results['eager', name]
+            cached = results['cached', name]
+            self.stdout.write(
+                '{:<14} eager {:8.3f} мс  cached {:8.3f} мс  '
+                'разница {:+7.2f}%'.format(
+                    name, eager, cached, (cached - eager) / eager * 100
+                )
+            )
+
+    def measure_processors(self, paths, request, repeat):
+        processors = [import_string(path) for path in paths]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for processor in processors:
+                processor(request)
+        return (time.perf_counter() - started) / repeat * 1e6
+
+    def measure(self, client, url, repeat):
+        # первый запрос прогревает загрузчик шаблонов и кэш лент
+        client.get(url)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
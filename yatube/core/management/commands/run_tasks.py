@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import tasks
+from core.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Воркер очереди фоновых задач core.Task на пуле потоков'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument(
+            '--batch', type=int, default=20,
+            help='Сколько задач забирать из очереди за раз'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти'
+        )
+        parser.add_argument(
+            '--purge-days', type=int, default=7,
+            help='Удалять выполненные задачи старше N дней'
+        )
+
+    def requeue_stale(self):
+        requeued, failed = tasks.requeue_stale()
+        if requeued:
+            self.stdout.write(f'Возвращено в очередь: {requeued}')
+        if failed:
+            self.stdout.write(f'Брошено с исчерпанными попытками: {failed}')
+
+    def handle(self, *args, **options):
+        self.requeue_stale()
+        swept_at = time.monotonic()
+        purged = tasks.purge_done(timedelta(days=options['purge_days']))
+        if purged:
+            self.stdout.write(f'Удалено выполненных: {purged}')
+        stats = {status: 0 for status, _ in Task.STATUS_CHOICES}
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                # воркер живёт долго: брошенные другими задачи ищем
+                # не только при старте
+                if time.monotonic() - swept_at >= settings.TASKS_STALE_AFTER:
+                    self.requeue_stale()
+                    swept_at = time.monotonic()
+                claimed = tasks.claim(options['batch'])
+                if not claimed:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                for status in pool.map(tasks.run_in_thread, claimed):
+                    stats[status] += 1
+        self.stdout.write(self.style.SUCCESS(
+            'Выполнено: {done}, повтор: {queued}, ошибок: {failed}'.format(
+                **stats
+            )
+        ))
@@ -0,0 +1,53 @@
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+
+ENCODING_NAMES = {'gz': 'gzip', 'br': 'brotli'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сколько байт экономят сжатые копии статики: по файлам из '
+        'compression.json, который пишет collectstatic'
+    )
+
+    def handle(self, *args, **options):
+        load_report = getattr(staticfiles_storage, 'load_report', None)
+        if load_report is None:
+            raise CommandError(
+                'STATICFILES_STORAGE не сжимает статику, нужен '
+                'core.storage.CompressedManifestStaticFilesStorage'
+            )
+        report = load_report()
+        if not report:
+            raise CommandError('Отчёта нет, сначала запустите collectstatic')
+        # без brotli при collectstatic .br-копий нет - и колонки тоже
+        encodings = [
+            encoding for encoding in ('gz', 'br')
+            if any(encoding in sizes for sizes in report.values())
+        ]
+        total = dict.fromkeys(['size', *encodings], 0)
+        for name, sizes in sorted(
+            report.items(), key=lambda item: item[1]['size'], reverse=True
+        ):
+            size = sizes['size']
+            total['size'] += size
+            columns = []
+            for encoding in encodings:
+                # несжатая копия не пишется, тогда клиент получит оригинал
+                compressed = sizes.get(encoding, size)
+                total[encoding] += compressed
+                columns.append('{} {:>9} (-{:>9})'.format(
+                    encoding, compressed, size - compressed
+                ))
+            self.stdout.write(
+                '{:>9}  {}  {}'.format(size, '  '.join(columns), name)
+            )
+        saved = ', '.join(
+            '{} экономит {}'.format(
+                ENCODING_NAMES[encoding], total['size'] - total[encoding]
+            )
+            for encoding in encodings
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Всего {total["size"]} байт, {saved}'
+        ))
@@ -0,0 +1,49 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную SQLite-базу в реплики DATABASE_REPLICAS через '
+        'backup API - замена настоящей репликации для локального запуска'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять каждые N секунд (0 - один раз)'
+        )
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]
+        if 'sqlite3' not in primary['ENGINE']:
+            raise CommandError(
+                'Команда только для SQLite: другие СУБД реплицируют себя сами'
+            )
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('Реплики не заданы, см. DB_REPLICAS')
+        while True:
+            started = time.perf_counter()
+            for alias in settings.DATABASE_REPLICAS:
+                self.copy(primary['NAME'], settings.DATABASES[alias]['NAME'])
+            self.stdout.write('Реплики обновлены за {:.1f} мс'.format(
+                (time.perf_counter() - started) * 1000
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, source_name, target_name):
+        # backup копирует согласованный снимок, даже пока идёт запись
+        source = sqlite3.connect(source_name)
+        target = sqlite3.connect(target_name)
+        try:
+            with target:
+                source.backup(target)
+        finally:
+            target.close()
+            source.close()
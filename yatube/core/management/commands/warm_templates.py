@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.prewarm import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает и разбирает все шаблоны, печатает время разбора '
+        'каждого; с cached.Loader шаблоны остаются в памяти процесса'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=20,
+            help='Сколько самых медленных шаблонов показать (0 - все)'
+        )
+
+    def handle(self, *args, **options):
+        report = warm_templates()
+        errors = [(name, error) for name, _, error in report if error]
+        slowest = sorted(report, key=lambda row: row[1], reverse=True)
+        if options['limit']:
+            slowest = slowest[:options['limit']]
+        for name, seconds, _ in slowest:
+            self.stdout.write(f'{seconds * 1000:8.2f} мс  {name}')
+        total = sum(seconds for _, seconds, _ in report)
+        self.stdout.write(self.style.SUCCESS(
+            f'Шаблонов: {len(report)}, всего {total * 1000:.1f} мс'
+        ))
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Шаблонов с ошибками: {len(errors)}')
@@ -0,0 +1,38 @@
+import time
+from contextvars import ContextVar
+
+# метрики текущего запроса; None - запрос не попал в выборку
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        """Обёртка для connection.execute_wrapper: считает каждый запрос."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += time.perf_counter() - started
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+
+def track_template(render):
+    """Выполняет render() и добавляет его время к метрикам запроса."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return render()
+    started = time.perf_counter()
+    try:
+        return render()
+    finally:
+        metrics.template_time += time.perf_counter() - started
@@ -0,0 +1,102 @@
+import json
+import logging
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import RequestMetrics, current_metrics
+from .routers import replica_reads, wrote_to_primary
+
+logger = logging.getLogger('yatube.requests')
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# пока кука жива, все чтения пользователя идут в основную базу
+REPLICA_STICKY_COOKIE = 'primary_reads'
+
+
+class RequestMetricsMiddleware:
+    """Число SQL-запросов, время SQL, шаблонов и всего запроса.
+
+    Пишет их в заголовок Server-Timing и строкой JSON в лог
+    yatube.requests для доли запросов REQUEST_METRICS_SAMPLE_RATE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.REQUEST_METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(metrics.sql_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        self.report(request, response, metrics)
+        return response
+
+    def report(self, request, response, metrics):
+        total = metrics.total_time
+        response['Server-Timing'] = (
+            'db;dur={:.2f};desc="{} queries", tpl;dur={:.2f}, '
+            'total;dur={:.2f}'.format(
+                metrics.sql_time * 1000,
+                metrics.queries,
+                metrics.template_time * 1000,
+                total * 1000,
+            )
+        )
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'view': match.view_name if match else None,
+            'queries': metrics.queries,
+            'sql_ms': round(metrics.sql_time * 1000, 2),
+            'template_ms': round(metrics.template_time * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+        }))
+
+
+class ReplicaRoutingMiddleware:
+    """Читающие запросы (GET, HEAD) обслуживаются репликами.
+
+    После записи (POST и прочие, а также GET, который писал в базу, как
+    подписка или выход) пользователь получает куку, и
+    REPLICA_STICKY_SECONDS секунд читает из основной базы: так он видит
+    свой новый пост, даже если реплика ещё не догнала основную базу.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        safe = request.method in SAFE_METHODS
+        use_replica = safe and REPLICA_STICKY_COOKIE not in request.COOKIES
+        token = wrote_to_primary.set(False)
+        try:
+            with replica_reads(use_replica):
+                response = self.get_response(request)
+            wrote = wrote_to_primary.get()
+        finally:
+            wrote_to_primary.reset(token)
+        if not safe or wrote:
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
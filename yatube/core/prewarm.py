@@ -0,0 +1,49 @@
+import os
+import time
+
+from django.template import TemplateSyntaxError, engines
+
+
+def loader_dirs(loaders):
+    for loader in loaders:
+        # cached.Loader оборачивает настоящие загрузчики
+        yield from loader_dirs(getattr(loader, 'loaders', ()))
+        get_dirs = getattr(loader, 'get_dirs', None)
+        if get_dirs is not None:
+            yield from get_dirs()
+
+
+def template_names(engine):
+    """Имена всех шаблонов, которые видят загрузчики движка."""
+    names = set()
+    for directory in loader_dirs(engine.template_loaders):
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                names.add(
+                    os.path.relpath(path, directory).replace(os.sep, '/')
+                )
+    return sorted(names)
+
+
+def warm_templates():
+    """Загружает и разбирает все шаблоны движков Django Templates.
+
+    С cached.Loader разобранные шаблоны остаются в памяти процесса, и
+    первый запрос после запуска не тратит время на чтение и разбор.
+    Возвращает [(имя, секунды, ошибка или None)].
+    """
+    report = []
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None:
+            continue
+        for name in template_names(engine):
+            started = time.perf_counter()
+            error = None
+            try:
+                engine.get_template(name)
+            except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+                error = exc
+            report.append((name, time.perf_counter() - started, error))
+    return report
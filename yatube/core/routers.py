@@ -0,0 +1,63 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# читать ли из реплик в текущем запросе; вне запросов (команды, воркер
+# задач) все чтения идут в основную базу
+replica_reads_enabled = ContextVar('replica_reads_enabled', default=False)
+# писал ли текущий запрос в основную базу; выставляет db_for_write,
+# читает ReplicaRoutingMiddleware
+wrote_to_primary = ContextVar('wrote_to_primary', default=False)
+# сессия читается сразу после записи (вход, выход), отставание реплики
+# тут недопустимо
+PRIMARY_APPS = {'sessions'}
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = replica_reads_enabled.set(enabled)
+    try:
+        yield
+    finally:
+        replica_reads_enabled.reset(token)
+
+
+@contextmanager
+def unsticky_writes():
+    """Служебные записи, после которых читать свою запись не нужно
+    (постановка фоновой задачи): кука основной базы от них не ставится."""
+    wrote = wrote_to_primary.get()
+    try:
+        yield
+    finally:
+        wrote_to_primary.set(wrote)
+
+
+class PrimaryReplicaRouter:
+    """Запись - в default, чтение - в случайную из DATABASE_REPLICAS,
+    если его разрешил core.middleware.ReplicaRoutingMiddleware."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            replicas
+            and replica_reads_enabled.get()
+            and model._meta.app_label not in PRIMARY_APPS
+        ):
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        wrote_to_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # реплики - копии default: объекты из любых баз связаны
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # схема приходит на реплики вместе с данными
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,79 @@
+import gzip
+import json
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен: без него только gzip
+    brotli = None
+
+REPORT_NAME = 'compression.json'
+
+
+def compressors():
+    """[(расширение, функция сжатия)] доступных кодировок."""
+    result = [('gz', lambda data: gzip.compress(data, 9, mtime=0))]
+    if brotli is not None:
+        result.append(('br', lambda data: brotli.compress(data, quality=11)))
+    return result
+
+
+def compressible(name):
+    return os.path.splitext(name)[1].lower() in (
+        settings.STATIC_COMPRESS_EXTENSIONS
+    )
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хэшами в именах и заранее сжатые копии файлов.
+
+    После обычной обработки collectstatic рядом с каждым хэшированным
+    текстовым файлом пишутся name.gz и name.br (если установлен brotli),
+    когда сжатие экономит хотя бы STATIC_COMPRESS_MIN_RATIO. Размеры
+    до и после сжатия сохраняются в compression.json для static_report.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        report = {}
+        for name in sorted(set(self.hashed_files.values())):
+            if compressible(name):
+                report[name] = self.compress(name)
+        self.save_report(report)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            data = original.read()
+        sizes = {'size': len(data)}
+        for encoding, compress in compressors():
+            compressed_name = f'{name}.{encoding}'
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            compressed = compress(data)
+            if len(compressed) > len(data) * (
+                1 - settings.STATIC_COMPRESS_MIN_RATIO
+            ):
+                continue
+            self._save(compressed_name, ContentFile(compressed))
+            sizes[encoding] = len(compressed)
+        return sizes
+
+    def save_report(self, report):
+        if self.exists(REPORT_NAME):
+            self.delete(REPORT_NAME)
+        self._save(
+            REPORT_NAME,
+            ContentFile(json.dumps(report, indent=2).encode())
+        )
+
+    def load_report(self):
+        if not self.exists(REPORT_NAME):
+            return {}
+        with self.open(REPORT_NAME) as report:
+            return json.loads(report.read().decode())
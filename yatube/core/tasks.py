@@ -0,0 +1,136 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger('yatube.tasks')
+
+registry = {}
+
+
+def task(func=None, *, max_attempts=None):
+    """Регистрирует функцию как фоновую задачу.
+
+    Аргументы задачи должны сериализоваться в JSON: передавайте pk,
+    а не объекты моделей. Функция получает метод delay(*args).
+    """
+    def register(func):
+        name = f'{func.__module__}.{func.__name__}'
+        registry[name] = func
+        func.task_name = name
+        func.delay = lambda *args: enqueue(
+            name, *args, max_attempts=max_attempts
+        )
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def enqueue(name, *args, max_attempts=None):
+    """Ставит задачу в очередь; при TASKS_EAGER выполняет сразу.
+
+    Строка задачи пишется в ту же транзакцию, что и изменения,
+    которые её породили: откат транзакции отменяет и задачу.
+    """
+    if settings.TASKS_EAGER:
+        return registry[name](*args)
+    return Task.objects.create(
+        name=name,
+        args=json.dumps(args),
+        max_attempts=max_attempts or settings.TASKS_MAX_ATTEMPTS
+    )
+
+
+def claim(limit):
+    """Забирает до limit готовых задач, помечая их running.
+
+    Условный UPDATE по статусу не даёт двум воркерам взять одну задачу.
+    """
+    ready = Task.objects.filter(
+        status=Task.QUEUED, run_after__lte=timezone.now()
+    ).values_list('pk', flat=True)[:limit]
+    claimed = []
+    for pk in list(ready):
+        taken = Task.objects.filter(pk=pk, status=Task.QUEUED).update(
+            status=Task.RUNNING,
+            attempts=F('attempts') + 1,
+            updated_at=timezone.now()
+        )
+        if taken:
+            claimed.append(pk)
+    return list(Task.objects.filter(pk__in=claimed))
+
+
+def requeue_stale():
+    """Возвращает в очередь задачи, брошенные упавшим воркером.
+
+    Задача, которая роняет воркер, исчерпывает попытки так же, как
+    упавшая с исключением: после max_attempts она помечается failed.
+    Возвращает (возвращено в очередь, помечено failed).
+    """
+    now = timezone.now()
+    stale = Task.objects.filter(
+        status=Task.RUNNING,
+        updated_at__lt=now - timedelta(seconds=settings.TASKS_STALE_AFTER)
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED,
+        last_error='Воркер не завершил задачу за TASKS_STALE_AFTER',
+        updated_at=now
+    )
+    if failed:
+        logger.error('Брошенных задач с исчерпанными попытками: %s', failed)
+    requeued = stale.update(status=Task.QUEUED, updated_at=now)
+    return requeued, failed
+
+
+def retry_delay(attempts):
+    # экспоненциальная задержка: 1x, 2x, 4x ... TASKS_RETRY_DELAY
+    return timedelta(seconds=settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def run(task_obj):
+    """Выполняет взятую задачу и записывает результат."""
+    try:
+        func = registry[task_obj.name]
+        func(*json.loads(task_obj.args))
+    except Exception:
+        task_obj.last_error = traceback.format_exc()
+        if task_obj.attempts < task_obj.max_attempts:
+            task_obj.status = Task.QUEUED
+            task_obj.run_after = timezone.now() + retry_delay(
+                task_obj.attempts
+            )
+        else:
+            task_obj.status = Task.FAILED
+            logger.error('Задача %s не выполнена: %s', task_obj.pk,
+                         task_obj.last_error)
+    else:
+        task_obj.status = Task.DONE
+    task_obj.save(update_fields=[
+        'status', 'run_after', 'last_error', 'updated_at'
+    ])
+    return task_obj.status
+
+
+def run_in_thread(task_obj):
+    # у каждого потока пула своё соединение с БД, закрываем его сами
+    try:
+        return run(task_obj)
+    finally:
+        connection.close()
+
+
+def purge_done(older_than):
+    return Task.objects.filter(
+        status=Task.DONE, updated_at__lt=timezone.now() - older_than
+    ).delete()[0]
@@ -0,0 +1,21 @@
+from django.template.backends import django as django_backend
+
+from . import metrics
+
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        return metrics.track_template(
+            lambda: super(Template, self).render(context, request)
+        )
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """Стандартный бэкенд, который учитывает время рендера в метриках
+    запроса (core.middleware.RequestMetricsMiddleware)."""
+
+    def from_string(self, template_code):
+        return Template(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return Template(super().get_template(template_name).template, self)
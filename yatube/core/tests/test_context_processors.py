@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from django.test import SimpleTestCase
+
+from core.context_processors.year import ExpiringValue, next_year_start, year
+
+
+class ContextProcessorsTest(SimpleTestCase):
+    def test_year(self):
+        """Проверка: year отдаёт текущий год"""
+        self.assertEqual(year(None), {'year': datetime.now().year})
+
+    def test_expiring_value(self):
+        """Проверка: значение пересчитывается только после срока"""
+        calls = []
+        value = ExpiringValue(
+            lambda: calls.append(1) or len(calls),
+            lambda current: 100
+        )
+        self.assertEqual(value.get(now=10), 1)
+        self.assertEqual(value.get(now=99), 1)
+        self.assertEqual(value.get(now=100), 2)
+        self.assertEqual(len(calls), 2)
+
+    def test_next_year_start(self):
+        """Проверка: год истекает 1 января следующего года"""
+        self.assertEqual(
+            next_year_start(2022), datetime(2023, 1, 1).timestamp()
+        )
@@ -0,0 +1,26 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+
+from core.db import check_connections
+
+
+class DatabaseTuningTest(TestCase):
+    def test_sqlite_pragmas(self):
+        """Проверка: новое соединение SQLite получает PRAGMA из настроек"""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            # 1 - NORMAL
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_health_check_closes_dead_connection(self):
+        """Проверка: в начале запроса мёртвое соединение закрывается"""
+        connection.ensure_connection()
+        with mock.patch.object(
+            connection, 'is_usable', return_value=False
+        ), mock.patch.object(connection, 'close') as close:
+            check_connections()
+        close.assert_called_once_with()
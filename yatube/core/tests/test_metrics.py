@@ -0,0 +1,48 @@
+import json
+import re
+
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from yatube.settings.base import LOGGING as BASE_LOGGING
+
+URL_INDEX = '/'
+SERVER_TIMING_RE = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=[\d.]+, total;dur=[\d.]+'
+)
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+    def setUp(self):
+        self.guest = Client()
+
+    def test_server_timing_header(self):
+        """Проверка: Server-Timing считает все SQL-запросы запроса"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest.get(URL_INDEX)
+        match = SERVER_TIMING_RE.fullmatch(response['Server-Timing'])
+        self.assertIsNotNone(match)
+        self.assertEqual(int(match.group(1)), len(queries))
+
+    def test_structured_log_line(self):
+        """Проверка: метрики пишутся в лог строкой JSON с именем view"""
+        with self.assertLogs('yatube.requests', 'INFO') as logs:
+            self.guest.get(URL_INDEX)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'posts:index')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['template_ms'], 0)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_sampling_off(self):
+        """Проверка: при нулевой доле выборки метрики не снимаются"""
+        self.assertNotIn('Server-Timing', self.guest.get(URL_INDEX))
+
+    def test_logger_configured(self):
+        """Проверка: у yatube.requests есть обработчик уровня INFO"""
+        config = BASE_LOGGING['loggers']['yatube.requests']
+        self.assertEqual(config['level'], 'INFO')
+        self.assertTrue(config['handlers'])
+        for handler in config['handlers']:
+            self.assertIn(handler, BASE_LOGGING['handlers'])
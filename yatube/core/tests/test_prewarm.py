@@ -0,0 +1,27 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from core.prewarm import warm_templates
+from yatube.settings.prod import TEMPLATES as PROD_TEMPLATES
+
+
+@override_settings(TEMPLATES=PROD_TEMPLATES)
+class WarmTemplatesTest(SimpleTestCase):
+    def test_templates_cached_after_warm(self):
+        """Проверка: после прогрева шаблоны лежат в кэше загрузчика"""
+        report = warm_templates()
+        names = [name for name, _, _ in report]
+        self.assertIn('base.html', names)
+        self.assertIn('posts/includes/paginator.html', names)
+        self.assertEqual([name for name, _, error in report if error], [])
+        loader = engines.all()[0].engine.template_loaders[0]
+        self.assertIn('base.html', loader.get_template_cache)
+
+    def test_command_reports_parse_time(self):
+        """Проверка: warm_templates печатает время разбора шаблонов"""
+        out = StringIO()
+        call_command('warm_templates', '--limit', '0', stdout=out)
+        self.assertIn('posts/index.html', out.getvalue())
@@ -0,0 +1,72 @@
+from django.contrib.sessions.models import Session
+from django.db import DEFAULT_DB_ALIAS, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware import REPLICA_STICKY_COOKIE, ReplicaRoutingMiddleware
+from core.routers import replica_reads
+from posts.models import Post
+
+REPLICA = 'replica'
+
+
+def read_alias(request):
+    # вместо view: куда пошло бы чтение постов в этом запросе
+    return HttpResponse(router.db_for_read(Post))
+
+
+def write_alias(request):
+    # GET-view с записью, как подписка на автора
+    return HttpResponse(router.db_for_write(Post))
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(read_alias)
+
+    def test_router(self):
+        """Проверка: запись всегда в default, чтение - по контексту"""
+        self.assertEqual(router.db_for_write(Post), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_read(Post), DEFAULT_DB_ALIAS)
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Post), REPLICA)
+            self.assertEqual(router.db_for_write(Post), DEFAULT_DB_ALIAS)
+        self.assertFalse(router.allow_migrate(REPLICA, 'posts'))
+
+    def test_sessions_read_from_primary(self):
+        """Проверка: сессии всегда читаются из default"""
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Session), DEFAULT_DB_ALIAS)
+
+    def test_get_reads_from_replica(self):
+        """Проверка: GET читает из реплики"""
+        response = self.middleware(self.factory.get('/'))
+        self.assertEqual(response.content.decode(), REPLICA)
+        self.assertNotIn(REPLICA_STICKY_COOKIE, response.cookies)
+
+    def test_sticky_primary_after_write(self):
+        """Проверка: после POST чтения идут в default, пока жива кука"""
+        response = self.middleware(self.factory.post('/'))
+        self.assertEqual(response.content.decode(), DEFAULT_DB_ALIAS)
+        self.assertIn(REPLICA_STICKY_COOKIE, response.cookies)
+        request = self.factory.get('/')
+        request.COOKIES[REPLICA_STICKY_COOKIE] = '1'
+        response = self.middleware(request)
+        self.assertEqual(response.content.decode(), DEFAULT_DB_ALIAS)
+
+    def test_sticky_after_write_on_get(self):
+        """Проверка: GET, который писал в базу, тоже ставит куку"""
+        response = ReplicaRoutingMiddleware(write_alias)(
+            self.factory.get('/')
+        )
+        self.assertIn(REPLICA_STICKY_COOKIE, response.cookies)
+        response = self.middleware(self.factory.get('/'))
+        self.assertNotIn(REPLICA_STICKY_COOKIE, response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        """Проверка: без реплик всё читается из default"""
+        response = self.middleware(self.factory.get('/'))
+        self.assertEqual(response.content.decode(), DEFAULT_DB_ALIAS)
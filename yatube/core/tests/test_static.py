@@ -0,0 +1,89 @@
+import gzip
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.views import hashed_names, serve_static
+
+CSS = 'css/bootstrap.min.css'
+STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+
+class CompressedStaticTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            STATIC_ROOT=cls.static_root, STATICFILES_STORAGE=STORAGE
+        )
+        cls.settings_override.enable()
+        call_command('collectstatic', '--noinput', verbosity=0)
+        cls.hashed_css = staticfiles_storage.stored_name(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.static_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def get(self, path, encoding='gzip, deflate'):
+        request = RequestFactory().get(
+            '/static/' + path, HTTP_ACCEPT_ENCODING=encoding
+        )
+        return serve_static(request, path)
+
+    def test_collectstatic_writes_hashed_gzip(self):
+        """Проверка: рядом с хэшированным css лежит его gzip-копия"""
+        self.assertNotEqual(self.hashed_css, CSS)
+        with staticfiles_storage.open(self.hashed_css) as original:
+            data = original.read()
+        with staticfiles_storage.open(self.hashed_css + '.gz') as packed:
+            self.assertEqual(gzip.decompress(packed.read()), data)
+        self.assertFalse(staticfiles_storage.exists(
+            staticfiles_storage.stored_name('img/logo.png') + '.gz'
+        ))
+
+    def test_hashed_file_is_immutable_and_compressed(self):
+        """Проверка: хэшированный файл отдаётся сжатым и immutable"""
+        response = self.get(self.hashed_css)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        response.close()
+
+    def test_hashed_names_built_once(self):
+        """Проверка: множество имён с хэшем не строится заново"""
+        names = hashed_names()
+        self.assertIn(self.hashed_css, names)
+        self.assertIs(hashed_names(), names)
+
+    def test_plain_name_and_identity_encoding(self):
+        """Проверка: имя без хэша кэшируется коротко, без сжатия"""
+        response = self.get(CSS, encoding='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response.close()
+        with self.assertRaises(Http404):
+            self.get('../manage.py')
+
+    def test_compressed_copies_and_manifests_not_served(self):
+        """Проверка: .gz/.br и манифесты напрямую не отдаются"""
+        for path in (self.hashed_css + '.gz', self.hashed_css + '.br',
+                     'staticfiles.json', 'compression.json'):
+            with self.subTest(path=path):
+                with self.assertRaises(Http404):
+                    self.get(path)
+
+    def test_report_command(self):
+        """Проверка: static_report печатает экономию по файлам"""
+        out = StringIO()
+        call_command('static_report', stdout=out)
+        self.assertIn(self.hashed_css, out.getvalue())
+        self.assertIn('gzip экономит', out.getvalue())
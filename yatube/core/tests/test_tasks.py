@@ -0,0 +1,109 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core import tasks
+from core.models import Task
+from posts import search
+from posts.models import Post
+
+User = get_user_model()
+
+STR_TEXT = 'фоновая задача'
+calls = []
+
+
+@tasks.task
+def remember(value):
+    calls.append(value)
+
+
+@tasks.task(max_attempts=2)
+def broken():
+    raise ValueError('сломано')
+
+
+@override_settings(TASKS_EAGER=False)
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode(self):
+        """Проверка: в eager-режиме задача выполняется сразу"""
+        remember.delay(1)
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.exists())
+
+    def test_enqueue_and_run(self):
+        """Проверка: задача ждёт в очереди и выполняется воркером"""
+        remember.delay(2)
+        self.assertEqual(calls, [])
+        claimed = tasks.claim(10)
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(tasks.claim(10), [])
+        self.assertEqual(tasks.run(claimed[0]), Task.DONE)
+        self.assertEqual(calls, [2])
+
+    def test_retry_then_fail(self):
+        """Проверка: упавшая задача повторяется, затем помечается failed"""
+        broken.delay()
+        task_obj = tasks.claim(10)[0]
+        self.assertEqual(tasks.run(task_obj), Task.QUEUED)
+        self.assertGreater(task_obj.run_after, timezone.now())
+        self.assertIn('сломано', task_obj.last_error)
+        Task.objects.update(run_after=timezone.now())
+        with self.assertLogs('yatube.tasks', 'ERROR'):
+            self.assertEqual(tasks.run(tasks.claim(10)[0]), Task.FAILED)
+
+    def test_stale_task_requeued_then_failed(self):
+        """Проверка: брошенная задача возвращается, пока есть попытки"""
+        broken.delay()
+        stale_at = timezone.now() - timedelta(hours=1)
+        tasks.claim(10)
+        Task.objects.update(updated_at=stale_at)
+        self.assertEqual(tasks.requeue_stale(), (1, 0))
+        self.assertEqual(Task.objects.get().status, Task.QUEUED)
+        tasks.claim(10)
+        Task.objects.update(updated_at=stale_at)
+        with self.assertLogs('yatube.tasks', 'ERROR'):
+            self.assertEqual(tasks.requeue_stale(), (0, 1))
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    def test_post_save_enqueues_side_effects(self):
+        """Проверка: сохранение поста ставит задачи, а не делает их"""
+        user = User.objects.create_user(username='writer')
+        Post.objects.create(text=STR_TEXT, author=user)
+        self.assertEqual(
+            set(Task.objects.values_list('name', flat=True)),
+            {
+                'posts.tasks.index_posts',
+                'posts.tasks.fan_out_posts',
+                'posts.tasks.notify_followers',
+            }
+        )
+        self.assertEqual(search.get_backend().search(STR_TEXT), [])
+
+
+@override_settings(TASKS_EAGER=False)
+class RunTasksCommandTest(TransactionTestCase):
+    def tearDown(self):
+        search.get_backend().clear()
+
+    def test_worker_runs_queue(self):
+        """Проверка: run_tasks выполняет очередь на пуле потоков"""
+        user = User.objects.create_user(username='writer')
+        post = Post.objects.create(text=STR_TEXT, author=user)
+        out = StringIO()
+        call_command('run_tasks', '--once', '--workers', '2', stdout=out)
+        self.assertEqual(
+            set(Task.objects.values_list('status', flat=True)), {Task.DONE}
+        )
+        self.assertEqual(
+            [pk for pk, _ in search.get_backend().search(STR_TEXT)],
+            [post.pk]
+        )
@@ -0,0 +1,105 @@
+import mimetypes
+import os
+import posixpath
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import require_safe
+
+from .storage import REPORT_NAME
+
+# Content-Encoding для расширений сжатых копий core.storage
+ENCODINGS = (('br', 'br'), ('gzip', 'gz'))
+
+
+def accepted_encodings(request):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых q=0."""
+    accepted = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+# (словарь hashed_files хранилища, его длина, имена с хэшем) - set имён
+# строится один раз на процесс, а не на каждый запрос
+_hashed_names = (None, 0, frozenset())
+
+
+def is_private(path):
+    """Сжатые копии отдаются только вместо оригинала, а манифест и
+    отчёт collectstatic - служебные файлы, не статика сайта."""
+    manifest = getattr(staticfiles_storage, 'manifest_name', None)
+    return (
+        path.endswith(tuple(f'.{suffix}' for _, suffix in ENCODINGS))
+        or path in (manifest, REPORT_NAME)
+    )
+
+
+def hashed_names():
+    """Имена файлов с хэшем из манифеста staticfiles_storage.
+
+    Множество пересобирается, только если хранилище подменили
+    (override_settings) или collectstatic дописал манифест.
+    """
+    global _hashed_names
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    files, size, names = _hashed_names
+    if files is not hashed_files or size != len(hashed_files):
+        names = frozenset(hashed_files.values())
+        _hashed_names = (hashed_files, len(hashed_files), names)
+    return names
+
+
+def is_hashed(path):
+    return path in hashed_names()
+
+
+@require_safe
+def serve_static(request, path):
+    """Статика из STATIC_ROOT со сжатыми копиями и долгим кэшированием.
+
+    Имена с хэшем из манифеста никогда не меняют содержимое, поэтому
+    отдаются с Cache-Control: immutable на STATIC_MAX_AGE, и браузер
+    не перепроверяет их на каждой странице. Остальные файлы кэшируются
+    на STATIC_UNHASHED_MAX_AGE.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    if (
+        path.startswith('..')
+        or is_private(path)
+        or not staticfiles_storage.exists(path)
+    ):
+        raise Http404(path)
+    full_path = staticfiles_storage.path(path)
+    if os.path.isdir(full_path):
+        raise Http404(path)
+    content_type, _ = mimetypes.guess_type(full_path)
+    encoding = None
+    accepted = accepted_encodings(request)
+    for coding, suffix in ENCODINGS:
+        if coding in accepted and os.path.exists(f'{full_path}.{suffix}'):
+            encoding = coding
+            full_path = f'{full_path}.{suffix}'
+            break
+    response = FileResponse(
+        open(full_path, 'rb'),
+        content_type=content_type or 'application/octet-stream'
+    )
+    if encoding is not None:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if is_hashed(path):
+        patch_cache_control(
+            response, public=True, max_age=settings.STATIC_MAX_AGE,
+            immutable=True
+        )
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.STATIC_UNHASHED_MAX_AGE
+        )
+    return response
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.contrib import admin
-from posts.models import Group, Post
+from posts.models import Follow, Group, Post
+from posts.search import get_backend
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -15,6 +17,37 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        # вместо LIKE '%...%' по search_fields - поисковый индекс
+        if not search_term:
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        hits = get_backend().search(
+            search_term, limit=settings.POSTS_ADMIN_SEARCH_LIMIT
+        )
+        return queryset.filter(pk__in=[pk for pk, _ in hits]), False
+
+
+class GroupAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'title',
+        'slug',
+        'posts_count',
+    )
+    search_fields = ('title',)
+
+
+class FollowAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'user',
+        'author',
+    )
+    search_fields = ('user__username', 'author__username')
+
 
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
+admin.site.register(Group, GroupAdmin)
+admin.site.register(Follow, FollowAdmin)
@@ -0,0 +1,179 @@
+"""JSON API только для чтения: те же ленты, что и в posts.urls.
+
+Ответы собираются из строк values(), без создания экземпляров моделей.
+?fields=id,text выбирает поля (и колонки запроса), ленты листаются
+курсором ?cursor=, а ETag строится из версий лент feed_cache.
+"""
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from . import conditional, feed_cache
+from .models import Group, Post, User
+from .utils import ValuesCursorPaginator
+
+# поле ответа -> колонка values()
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'html': 'text_html',
+    'excerpt': 'excerpt',
+    'excerpt_html': 'excerpt_html',
+    'image': 'image',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+# ленты не читают полный текст, как и HTML-страницы лент
+FEED_DEFAULT_FIELDS = ('id', 'author', 'group', 'pub_date', 'excerpt_html',
+                       'image')
+DETAIL_DEFAULT_FIELDS = ('id', 'author', 'group', 'pub_date', 'updated_at',
+                         'html', 'image')
+# без них не построить курсор и ETag
+FEED_KEY_COLUMNS = ('id', 'pub_date')
+DETAIL_KEY_COLUMNS = ('id', 'updated_at', 'render_version')
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def json_response(data, **kwargs):
+    # кириллица в UTF-8 вдвое короче escape-последовательностей \uXXXX
+    return JsonResponse(
+        data, json_dumps_params={'ensure_ascii': False}, **kwargs
+    )
+
+
+def error(message, status):
+    return json_response({'detail': message}, status=status)
+
+
+def requested_fields(request, default):
+    """Поля из ?fields= в порядке запроса или default."""
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(default)
+    fields = list(dict.fromkeys(
+        name.strip() for name in raw.split(',') if name.strip()
+    ))
+    unknown = [name for name in fields if name not in POST_FIELDS]
+    if unknown or not fields:
+        raise FieldsError('Неизвестные поля: {}. Доступны: {}'.format(
+            ', '.join(unknown), ', '.join(POST_FIELDS)
+        ))
+    return fields
+
+
+def post_rows(queryset, fields, key_columns):
+    columns = dict.fromkeys(
+        [*key_columns, *(POST_FIELDS[name] for name in fields)]
+    )
+    return queryset.order_by().values(*columns)
+
+
+def serialize(row, fields):
+    data = {name: row[POST_FIELDS[name]] for name in fields}
+    if 'image' in data:
+        data['image'] = (
+            default_storage.url(data['image']) if data['image'] else None
+        )
+    return data
+
+
+def page_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return '{}?{}'.format(request.path, query.urlencode())
+
+
+def feed_response(request, queryset, feed_key, extra=None):
+    """Страница ленты по курсору с ETag от версии ленты feed_key."""
+    try:
+        fields = requested_fields(request, FEED_DEFAULT_FIELDS)
+    except FieldsError as exc:
+        return error(str(exc), 400)
+    etag = conditional.feed_etag(request, feed_key, 'api', *fields)
+    response = conditional.not_modified(request, etag)
+    if response:
+        return response
+    page = ValuesCursorPaginator(
+        post_rows(queryset, fields, FEED_KEY_COLUMNS),
+        settings.LIMIT_POSTS_TEN
+    ).get_page(request.GET.get('cursor'))
+    data = dict(extra or {})
+    data.update({
+        'results': [serialize(row, fields) for row in page],
+        'next': page_url(request, page.next_cursor),
+        'previous': page_url(request, page.previous_cursor),
+    })
+    return conditional.set_validators(json_response(data), etag)
+
+
+@require_safe
+def post_list(request):
+    return feed_response(request, Post.objects.all(), feed_cache.INDEX)
+
+
+@require_safe
+def group_posts(request, slug):
+    group = Group.objects.filter(slug=slug).values(
+        'id', 'title', 'slug', 'description', 'posts_count'
+    ).first()
+    if group is None:
+        return error('Группа не найдена', 404)
+    return feed_response(
+        request,
+        Post.objects.filter(group_id=group['id']),
+        feed_cache.group_key(group['id']),
+        {'group': {key: group[key] for key in group if key != 'id'}}
+    )
+
+
+@require_safe
+def profile(request, username):
+    author = User.objects.filter(username=username).values(
+        'id', 'username', 'first_name', 'last_name', 'stats__posts_count'
+    ).first()
+    if author is None:
+        return error('Пользователь не найден', 404)
+    return feed_response(
+        request,
+        Post.objects.filter(author_id=author['id']),
+        feed_cache.author_key(author['id']),
+        {'author': {
+            'username': author['username'],
+            'first_name': author['first_name'],
+            'last_name': author['last_name'],
+            'posts_count': author['stats__posts_count'] or 0,
+        }}
+    )
+
+
+@require_safe
+def post_detail(request, post_id):
+    try:
+        fields = requested_fields(request, DETAIL_DEFAULT_FIELDS)
+    except FieldsError as exc:
+        return error(str(exc), 400)
+    row = post_rows(
+        Post.objects.filter(pk=post_id), fields, DETAIL_KEY_COLUMNS
+    ).first()
+    if row is None:
+        return error('Пост не найден', 404)
+    # автор и группа выводятся по username и slug: их смена меняет ETag
+    etag = conditional.make_etag(
+        'api', row['id'], row['updated_at'].timestamp(),
+        row['render_version'], row.get('author__username'),
+        row.get('group__slug'), *fields
+    )
+    response = conditional.not_modified(request, etag)
+    if response:
+        return response
+    return conditional.set_validators(
+        json_response(serialize(row, fields)), etag
+    )
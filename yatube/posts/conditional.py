@@ -0,0 +1,67 @@
+import hashlib
+from calendar import timegm
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import feed_cache
+
+
+def make_etag(*parts):
+    return quote_etag(
+        hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+    )
+
+
+def feed_etag(request, feed_key, *extra):
+    # шапка страницы зависит от пользователя, поэтому он входит в ETag;
+    # extra - прочее состояние страницы вне ленты (кнопка подписки)
+    return make_etag(
+        feed_key,
+        feed_cache.get_version(feed_key),
+        settings.POSTS_PAGINATION,
+        request.GET.get('page', ''),
+        request.GET.get('cursor', ''),
+        request.user.pk,
+        *extra
+    )
+
+
+def post_last_modified(post):
+    """Пост меняется сам и вместе со счётчиком постов автора."""
+    stats = getattr(post.author, 'stats', None)
+    if stats is None:
+        return post.updated_at
+    return max(post.updated_at, stats.updated_at)
+
+
+def post_etag(request, post, *extra):
+    # rerender_posts меняет HTML, не трогая updated_at; имя автора и
+    # группа выводятся на странице, но их правка не меняет сам пост;
+    # extra - прочее состояние страницы (готова ли миниатюра картинки)
+    group = post.group
+    return make_etag(
+        post.pk, post_last_modified(post).timestamp(), post.render_version,
+        post.author.username, post.author.get_full_name(),
+        group.slug if group else '', group.title if group else '',
+        request.user.pk, *extra
+    )
+
+
+def not_modified(request, etag, last_modified=None):
+    """Ответ 304/412 по If-None-Match/If-Modified-Since или None."""
+    if last_modified is not None:
+        last_modified = timegm(last_modified.utctimetuple())
+    return get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(
+            timegm(last_modified.utctimetuple())
+        )
+    return response
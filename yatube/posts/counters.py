@@ -0,0 +1,118 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import AuthorStats, Follow, Group, Post
+
+
+def change_stats(author_id, field, delta):
+    updated = AuthorStats.objects.filter(author_id=author_id).update(
+        **{field: F(field) + delta},
+        updated_at=timezone.now()
+    )
+    # при удалении автора каскад сначала удаляет AuthorStats, а затем
+    # посты: уменьшение не должно создавать строку заново
+    if not updated and delta > 0:
+        # строки ещё нет - считаем с нуля, заодно лечим рассинхрон
+        AuthorStats.objects.update_or_create(
+            author_id=author_id,
+            defaults={
+                'posts_count': Post.objects.filter(
+                    author_id=author_id
+                ).count(),
+                'followers_count': Follow.objects.filter(
+                    author_id=author_id
+                ).count(),
+            }
+        )
+
+
+def change_author_count(author_id, delta):
+    change_stats(author_id, 'posts_count', delta)
+
+
+def change_followers_count(author_id, delta):
+    change_stats(author_id, 'followers_count', delta)
+
+
+def change_group_count(group_id, delta):
+    if group_id is not None:
+        Group.objects.filter(pk=group_id).update(
+            posts_count=F('posts_count') + delta
+        )
+
+
+def apply_bulk_counts(posts):
+    """Один UPDATE на автора и на группу для пачки новых постов."""
+    for author_id, delta in Counter(post.author_id for post in posts).items():
+        change_author_count(author_id, delta)
+    for group_id, delta in Counter(post.group_id for post in posts).items():
+        change_group_count(group_id, delta)
+
+
+def actual_author_counts():
+    return dict(
+        Post.objects.order_by().values_list('author').annotate(Count('pk'))
+    )
+
+
+def actual_followers_counts():
+    return dict(
+        Follow.objects.order_by().values_list('author').annotate(Count('pk'))
+    )
+
+
+def actual_group_counts():
+    return dict(
+        Post.objects.order_by().filter(group__isnull=False)
+        .values_list('group').annotate(Count('pk'))
+    )
+
+
+@transaction.atomic
+def rebuild_counters():
+    """Пересчитывает все счётчики с нуля по таблице постов."""
+    author_counts = actual_author_counts()
+    followers_counts = actual_followers_counts()
+    AuthorStats.objects.all().delete()
+    AuthorStats.objects.bulk_create(
+        AuthorStats(
+            author_id=author_id,
+            posts_count=author_counts.get(author_id, 0),
+            followers_count=followers_counts.get(author_id, 0)
+        )
+        for author_id in set(author_counts) | set(followers_counts)
+    )
+    group_counts = actual_group_counts()
+    groups = list(Group.objects.only('pk', 'posts_count'))
+    for group in groups:
+        group.posts_count = group_counts.get(group.pk, 0)
+    Group.objects.bulk_update(groups, ['posts_count'], batch_size=500)
+    return len(set(author_counts) | set(followers_counts)), len(groups)
+
+
+def find_inconsistencies():
+    """Список (объект, сохранённое значение, фактическое значение)."""
+    problems = []
+    for field, actual_counts in (
+        ('posts_count', actual_author_counts()),
+        ('followers_count', actual_followers_counts()),
+    ):
+        stored = dict(AuthorStats.objects.values_list('author', field))
+        for author_id in set(actual_counts) | set(stored):
+            actual = actual_counts.get(author_id, 0)
+            if stored.get(author_id, 0) != actual:
+                problems.append(
+                    (f'author:{author_id}:{field}', stored.get(author_id),
+                     actual)
+                )
+    group_counts = actual_group_counts()
+    for group_id, posts_count in Group.objects.values_list(
+        'pk', 'posts_count'
+    ):
+        actual = group_counts.get(group_id, 0)
+        if posts_count != actual:
+            problems.append((f'group:{group_id}', posts_count, actual))
+    return problems
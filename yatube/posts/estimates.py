@@ -0,0 +1,99 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+
+from core.routers import unsticky_writes
+from core.tasks import enqueue
+
+from .models import AuthorStats, Post
+
+ESTIMATE_KEY = 'post-count-estimate'
+REFRESH_LOCK_KEY = 'post-count-estimate:refresh'
+
+
+def statistics_estimate():
+    """Число строк posts_post по статистике планировщика или None."""
+    table = Post._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [table]
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone() is None:
+                return None
+            # первое число stat - строк в таблице на момент ANALYZE
+            cursor.execute(
+                'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                [table]
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    value = int(str(row[0]).split()[0])
+    return value if value >= 0 else None
+
+
+def compute_estimate():
+    estimate = statistics_estimate()
+    if estimate is None:
+        # счётчики авторов: строк в разы меньше, чем постов
+        estimate = AuthorStats.objects.aggregate(
+            total=Sum('posts_count')
+        )['total'] or 0
+    return estimate
+
+
+def store(estimate):
+    cache.set(
+        ESTIMATE_KEY,
+        (estimate, time.time() + settings.POSTS_COUNT_ESTIMATE_TIMEOUT),
+        None
+    )
+
+
+def refresh():
+    """Обновляет статистику и закэшированную оценку (фоновая задача)."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Post._meta.db_table}')
+    estimate = compute_estimate()
+    store(estimate)
+    cache.delete(REFRESH_LOCK_KEY)
+    return estimate
+
+
+def post_count_estimate():
+    """Оценка числа всех постов без COUNT(*).
+
+    Устаревшая оценка отдаётся как есть, а пересчёт уходит в фоновую
+    задачу; ключ-замок держит в очереди не больше одной такой задачи.
+    Строка задачи пишется в основную базу, но читателя к ней не
+    привязывает: это не его запись.
+    """
+    cached = cache.get(ESTIMATE_KEY)
+    if cached is None:
+        estimate = compute_estimate()
+        store(estimate)
+        return estimate
+    estimate, expires = cached
+    if time.time() >= expires and cache.add(
+        REFRESH_LOCK_KEY, 1, settings.POSTS_COUNT_ESTIMATE_TIMEOUT
+    ):
+        try:
+            with unsticky_writes():
+                enqueue('posts.tasks.refresh_post_count_estimate')
+        except Exception:
+            # задача не поставлена: следующий запрос попробует снова
+            cache.delete(REFRESH_LOCK_KEY)
+            raise
+    return estimate
@@ -0,0 +1,108 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'feed-version:{}'
+FRAGMENT_KEY = 'feed-fragment:{}:{}:{}'
+COUNT_KEY = 'feed-count:{}:{}'
+SYNDICATION_KEY = 'feed-xml:{}:{}:{}'
+HITS_KEY = 'feed-cache:hits'
+MISSES_KEY = 'feed-cache:misses'
+
+INDEX = 'index'
+
+
+def group_key(group_id):
+    return f'group:{group_id}'
+
+
+def author_key(author_id):
+    return f'author:{author_id}'
+
+
+def follow_key(user_id, author_id):
+    # не лента, а версия подписки: кнопка в профиле без запроса к базе
+    return f'follow:{user_id}:{author_id}'
+
+
+def post_feed_keys(author_ids, group_ids):
+    """Ленты, в которых виден пост с такими авторами и группами."""
+    keys = {INDEX}
+    keys.update(author_key(author_id) for author_id in author_ids)
+    keys.update(
+        group_key(group_id) for group_id in group_ids if group_id is not None
+    )
+    return keys
+
+
+def get_version(feed_key):
+    # версия - случайная строка, а не счётчик: если кэш вытеснит ключ
+    # версии, старые фрагменты не воскреснут под тем же номером
+    key = VERSION_KEY.format(feed_key)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(feed_keys):
+    cache.set_many(
+        {VERSION_KEY.format(key): uuid.uuid4().hex for key in feed_keys},
+        None
+    )
+
+
+def page_key(page_obj):
+    if getattr(page_obj, 'is_cursor', False):
+        return 'cursor-{}'.format(page_obj.cursor or '')
+    return 'page-{}'.format(page_obj.number)
+
+
+def fragment_key(feed_key, page_obj):
+    return FRAGMENT_KEY.format(
+        feed_key, get_version(feed_key), page_key(page_obj)
+    )
+
+
+def syndication_key(feed_key, feed_format):
+    """Ключ готового XML RSS/Atom-ленты под её текущей версией."""
+    return SYNDICATION_KEY.format(
+        feed_key, get_version(feed_key), feed_format
+    )
+
+
+def get_fragment(key):
+    html = cache.get(key)
+    incr(MISSES_KEY if html is None else HITS_KEY)
+    return html
+
+
+def set_fragment(key, html):
+    cache.set(key, html, settings.FEED_CACHE_TIMEOUT)
+
+
+def get_count(feed_key, compute):
+    """Число постов ленты, пересчитывается после записи в ленту."""
+    key = COUNT_KEY.format(feed_key, get_version(feed_key))
+    count = cache.get(key)
+    if count is None:
+        count = compute()
+        cache.set(key, count, settings.FEED_CACHE_TIMEOUT)
+    return count
+
+
+def incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def stats():
+    return {
+        'hits': cache.get(HITS_KEY, 0),
+        'misses': cache.get(MISSES_KEY, 0),
+    }
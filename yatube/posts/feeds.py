@@ -0,0 +1,179 @@
+"""RSS и Atom для общей ленты, групп и авторов.
+
+Готовый XML лежит в кэше под версией ленты из feed_cache, так что новый
+пост сам делает его устаревшим. Клиент, который опрашивает ленту,
+получает 304 по ETag или XML из кэша: для общей ленты без запросов к
+базе, для ленты группы или автора - с одним запросом pk по индексу.
+"""
+from django.conf import settings
+from django.contrib.sites.shortcuts import get_current_site
+from django.contrib.syndication.views import Feed, add_domain
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from . import conditional, feed_cache
+from .models import Group, Post, User
+
+ITEM_TITLE_LENGTH = 60
+
+
+class CachedPostsFeed(Feed):
+    """Лента постов с кэшем XML и условным GET.
+
+    Наследники задают feed_key(**kwargs) - ключ ленты feed_cache, и
+    posts(obj) - посты ленты.
+    """
+    feed_format = 'rss'
+
+    def feed_key(self, **kwargs):
+        return feed_cache.INDEX
+
+    def __call__(self, request, *args, **kwargs):
+        feed_key = self.feed_key(**kwargs)
+        etag = conditional.make_etag(
+            'syndication', feed_key, feed_cache.get_version(feed_key),
+            self.feed_format
+        )
+        response = conditional.not_modified(request, etag)
+        if response:
+            return response
+        cache_key = feed_cache.syndication_key(feed_key, self.feed_format)
+        cached = feed_cache.get_fragment(cache_key)
+        if cached is None:
+            response = super().__call__(request, *args, **kwargs)
+            feed_cache.set_fragment(cache_key, {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'last_modified': response.get('Last-Modified'),
+            })
+        else:
+            response = HttpResponse(
+                cached['content'], content_type=cached['content_type']
+            )
+            if cached['last_modified']:
+                response['Last-Modified'] = cached['last_modified']
+        response['ETag'] = etag
+        return response
+
+    def get_feed(self, obj, request):
+        feed = super().get_feed(obj, request)
+        # ссылку на автора Feed, в отличие от ссылки на пост, оставляет
+        # как есть, а читалкам лент нужен абсолютный адрес
+        domain = get_current_site(request).domain
+        for item in feed.items:
+            if item['author_link']:
+                item['author_link'] = add_domain(
+                    domain, item['author_link'], request.is_secure()
+                )
+        return feed
+
+    def posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        return self.posts(obj).with_related().defer('text')[
+            :settings.SYNDICATION_ITEMS
+        ]
+
+    def item_title(self, post):
+        return Truncator(post.excerpt).chars(ITEM_TITLE_LENGTH)
+
+    def item_description(self, post):
+        return post.text_html
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_author_link(self, post):
+        return reverse('posts:profile', args=[post.author.username])
+
+
+class LatestPostsFeed(CachedPostsFeed):
+    title = 'Yatube: последние записи'
+    description = 'Новые посты всех авторов'
+
+    def link(self):
+        return reverse('posts:index')
+
+
+class GroupPostsFeed(CachedPostsFeed):
+    def feed_key(self, slug):
+        # pk не кэшируется: slug могли отдать другой группе, а запрос
+        # идёт по уникальному индексу
+        group_id = Group.objects.filter(slug=slug).values_list(
+            'pk', flat=True
+        ).first()
+        if group_id is None:
+            raise Http404('Группа не найдена')
+        return feed_cache.group_key(group_id)
+
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    def link(self, group):
+        return reverse('posts:group_list', args=[group.slug])
+
+    def posts(self, group):
+        return group.posts.all()
+
+
+class AuthorPostsFeed(CachedPostsFeed):
+    def feed_key(self, username):
+        author_id = User.objects.filter(username=username).values_list(
+            'pk', flat=True
+        ).first()
+        if author_id is None:
+            raise Http404('Пользователь не найден')
+        return feed_cache.author_key(author_id)
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return 'Yatube: {}'.format(author.get_full_name() or author.username)
+
+    def description(self, author):
+        return f'Посты пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('posts:profile', args=[author.username])
+
+    def posts(self, author):
+        return author.posts.all()
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    feed_format = 'atom'
+    subtitle = LatestPostsFeed.description
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+    feed_format = 'atom'
+
+    def subtitle(self, group):
+        return self.description(group)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+    feed_format = 'atom'
+
+    def subtitle(self, author):
+        return self.description(author)
@@ -1,14 +1,38 @@
+from django import forms
 from django.forms import ModelForm
 
-from .models import Post
+from .models import Group, Post, User
 
 
 class PostForm(ModelForm):
     class Meta:
         model = Post
-        fields = ('text', 'group')
-        labels = {'text': 'Текст поста', 'group': 'Группа'}
+        fields = ('text', 'group', 'image')
+        labels = {
+            'text': 'Текст поста',
+            'group': 'Группа',
+            'image': 'Картинка'
+        }
         help_texts = {
             'text': 'Текст нового поста',
-            'group': 'Группа, к которой будет относиться пост'
+            'group': 'Группа, к которой будет относиться пост',
+            'image': 'Необязательная картинка к посту'
         }
+
+
+class SearchForm(forms.Form):
+    q = forms.CharField(label='Поиск', max_length=200)
+    group = forms.ModelChoiceField(
+        Group.objects.all(),
+        to_field_name='slug',
+        required=False,
+        label='Группа'
+    )
+    author = forms.ModelChoiceField(
+        User.objects.all(),
+        to_field_name='username',
+        required=False,
+        widget=forms.TextInput,
+        label='Автор',
+        help_text='Имя пользователя'
+    )
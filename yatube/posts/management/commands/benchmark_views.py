@@ -0,0 +1,140 @@
+import json
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from posts.models import AuthorStats, Group, Post
+
+
+def percentile(values, fraction):
+    """Перцентиль с линейной интерполяцией, как numpy.percentile."""
+    values = sorted(values)
+    position = (len(values) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (
+        position - lower
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет страницы posts.urls через тестовый клиент и пишет '
+        'p50/p95 времени ответа и число SQL-запросов в JSON-отчёт'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--output', default='benchmark.json',
+            help='Куда записать отчёт'
+        )
+        parser.add_argument(
+            '--compare',
+            help='Предыдущий отчёт: напечатать разницу с ним'
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Очищать кэш перед каждым запросом'
+        )
+
+    def handle(self, *args, **options):
+        post = Post.objects.order_by('-pub_date', '-id').first()
+        stats = AuthorStats.objects.select_related('author').order_by(
+            '-posts_count'
+        ).first()
+        group = Group.objects.order_by('-posts_count').first()
+        if post is None or stats is None or group is None:
+            raise CommandError('Нет данных, сначала запустите seed_benchmark')
+        author = stats.author
+        pages = math.ceil(
+            Post.objects.count() / settings.LIMIT_POSTS_TEN
+        )
+        urls = {
+            'index': reverse('posts:index'),
+            'index_middle': '{}?page={}'.format(
+                reverse('posts:index'), max(pages // 2, 1)
+            ),
+            'index_last': '{}?page={}'.format(reverse('posts:index'), pages),
+            'group_list': reverse('posts:group_list', args=[group.slug]),
+            'profile': reverse('posts:profile', args=[author.username]),
+            'post_detail': reverse('posts:post_detail', args=[post.pk]),
+            'post_create': reverse('posts:post_create'),
+            'post_edit': reverse('posts:post_edit', args=[post.pk]),
+            'post_search': '{}?{}'.format(
+                reverse('posts:post_search'),
+                urlencode({'q': post.text.split()[0]})
+            ),
+        }
+        client = Client()
+        # create/edit требуют входа, edit - ещё и авторства
+        client.force_login(post.author)
+        results = {}
+        for name, url in urls.items():
+            results[name] = self.measure(client, url, options)
+            self.stdout.write(
+                '{:<14} p50 {p50_ms:8.2f} мс  p95 {p95_ms:8.2f} мс  '
+                'запросов {queries}'.format(name, **results[name])
+            )
+        report = {
+            'created': timezone.now().isoformat(),
+            'posts': Post.objects.count(),
+            'pagination': settings.POSTS_PAGINATION,
+            'repeat': options['repeat'],
+            'cold': options['cold'],
+            'views': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Отчёт записан в {options["output"]}'
+        ))
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def measure(self, client, url, options):
+        timings = []
+        queries = []
+        for _ in range(options['repeat']):
+            if options['cold']:
+                cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f'{url} ответил {response.status_code}')
+            queries.append(len(captured))
+        return {
+            'url': url,
+            'p50_ms': round(percentile(timings, 0.5), 3),
+            'p95_ms': round(percentile(timings, 0.95), 3),
+            'queries': max(queries),
+        }
+
+    def compare(self, path, results):
+        with open(path, encoding='utf-8') as previous:
+            before = json.load(previous)['views']
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Сравнение с {path}'))
+        for name, current in results.items():
+            if name not in before:
+                continue
+            old = before[name]
+            self.stdout.write(
+                '{:<14} p50 {:+8.2f} мс  p95 {:+8.2f} мс  '
+                'запросов {:+d}'.format(
+                    name,
+                    current['p50_ms'] - old['p50_ms'],
+                    current['p95_ms'] - old['p95_ms'],
+                    current['queries'] - old['queries'],
+                )
+            )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.counters import find_inconsistencies
+
+
+class Command(BaseCommand):
+    help = 'Сверяет счётчики постов авторов и групп с таблицей постов'
+
+    def handle(self, *args, **options):
+        problems = find_inconsistencies()
+        for key, stored, actual in problems:
+            self.stdout.write(f'{key}: сохранено {stored}, на деле {actual}')
+        if problems:
+            raise CommandError(
+                f'Расхождений: {len(problems)}, '
+                'запустите rebuild_post_counters'
+            )
+        self.stdout.write(self.style.SUCCESS('Счётчики согласованы'))
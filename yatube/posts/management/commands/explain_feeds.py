@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import timeline
+from posts.models import AuthorStats, Group, Post, TimelineEntry, User
+from posts.utils import CURSOR_NEXT, CursorPaginator
+
+# признаки сортировки в памяти в планах sqlite и postgresql
+FILESORT_MARKERS = ('USE TEMP B-TREE FOR ORDER BY', 'Sort Key')
+
+
+class Command(BaseCommand):
+    help = (
+        'Печатает EXPLAIN QUERY PLAN для запросов лент index, group_list, '
+        'profile, follow_index и post_detail'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page', type=int, default=1,
+            help='Номер страницы для OFFSET-запросов'
+        )
+        parser.add_argument('--group', help='slug группы для group_list')
+        parser.add_argument('--author', help='username для profile')
+
+    def handle(self, *args, **options):
+        post = Post.objects.order_by('-pub_date', '-id').first()
+        if post is None:
+            raise CommandError('В базе нет постов, запустите seed-данные')
+        group = self.get_group(options['group'])
+        author = self.get_author(options['author'])
+        limit = settings.LIMIT_POSTS_TEN
+        offset = (options['page'] - 1) * limit
+        feeds = {
+            'index': Post.objects.feed(),
+            'group_list': Post.objects.feed().filter(group=group),
+            'profile': Post.objects.feed().filter(author=author),
+        }
+        queries = []
+        for name, queryset in feeds.items():
+            queries.append(
+                (f'{name} page', queryset[offset:offset + limit])
+            )
+            queries.append((
+                f'{name} cursor',
+                CursorPaginator(queryset, limit).window(
+                    CURSOR_NEXT, post.pub_date, post.pk
+                )
+            ))
+        reader_id = TimelineEntry.objects.values_list(
+            'user', flat=True
+        ).first()
+        if reader_id is not None:
+            queries.append((
+                'follow_index page',
+                timeline.feed_for(User(pk=reader_id))[offset:offset + limit]
+            ))
+        queries.append(
+            ('post_detail', Post.objects.with_related().filter(pk=post.pk))
+        )
+        filesorts = 0
+        for name, queryset in queries:
+            plan = queryset.explain()
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            if any(marker in plan for marker in FILESORT_MARKERS):
+                filesorts += 1
+                self.stdout.write(self.style.WARNING('  сортировка в памяти'))
+        if filesorts:
+            raise CommandError(f'Запросов с сортировкой в памяти: {filesorts}')
+        self.stdout.write(self.style.SUCCESS('Все ленты читаются по индексу'))
+
+    def get_group(self, slug):
+        if slug:
+            return Group.objects.get(slug=slug)
+        return Group.objects.order_by('-posts_count').first()
+
+    def get_author(self, username):
+        if username:
+            return User.objects.get(username=username)
+        stats = AuthorStats.objects.order_by('-posts_count').first()
+        return stats.author if stats else None
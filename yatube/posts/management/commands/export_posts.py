@@ -0,0 +1,40 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import FORMAT_JSONL, FORMATS, export_rows, write_rows
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты в JSON Lines или CSV потоково'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Файл для выгрузки, по умолчанию stdout'
+        )
+        parser.add_argument('--format', choices=FORMATS, default=FORMAT_JSONL)
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Сколько строк читать из БД за раз'
+        )
+
+    def handle(self, *args, **options):
+        if options['path'] == '-':
+            self.export(sys.stdout, options)
+        else:
+            with open(options['path'], 'w', newline='',
+                      encoding='utf-8') as stream:
+                self.export(stream, options)
+
+    def export(self, stream, options):
+        started = time.monotonic()
+        total = write_rows(
+            export_rows(options['chunk_size']), stream, options['format']
+        )
+        elapsed = time.monotonic() - started
+        self.stderr.write(
+            f'Выгружено постов: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-6):.0f} строк/с)'
+        )
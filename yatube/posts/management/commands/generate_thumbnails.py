@@ -0,0 +1,60 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from posts import tasks
+from posts.models import Post
+
+
+def init_worker():
+    # при spawn процесс стартует с нуля, при fork setup() ничего не делает
+    django.setup()
+
+
+def generate_chunk(post_ids):
+    tasks.generate_thumbnails(post_ids)
+    return len(post_ids)
+
+
+class Command(BaseCommand):
+    help = (
+        'Заранее готовит миниатюры картинок всех постов на пуле '
+        'процессов: ресайз упирается в CPU, потоки тут не помогут'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count(),
+            help='Число процессов (0 - в текущем процессе)'
+        )
+        parser.add_argument(
+            '--chunk', type=int, default=50,
+            help='Сколько постов отдавать процессу за раз'
+        )
+
+    def handle(self, *args, **options):
+        post_ids = list(
+            Post.objects.exclude(image='').order_by('pk').values_list(
+                'pk', flat=True
+            )
+        )
+        size = options['chunk']
+        chunks = [
+            post_ids[start:start + size]
+            for start in range(0, len(post_ids), size)
+        ]
+        if options['processes']:
+            # дочерние процессы не должны делить сокет соединения с БД
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options['processes'], initializer=init_worker
+            ) as pool:
+                total = sum(pool.map(generate_chunk, chunks))
+        else:
+            total = sum(map(generate_chunk, chunks))
+        self.stdout.write(self.style.SUCCESS(
+            f'Постов с картинками: {total}'
+        ))
@@ -0,0 +1,50 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import FORMAT_JSONL, FORMATS, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает посты из JSON Lines или CSV пачками через bulk_create; '
+        'поля: text, pub_date, author (username), group (slug)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Файл для загрузки, по умолчанию stdin'
+        )
+        parser.add_argument('--format', choices=FORMATS, default=FORMAT_JSONL)
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько постов вставлять в одной транзакции'
+        )
+
+    def handle(self, *args, **options):
+        if options['path'] == '-':
+            self.load(sys.stdin, options)
+        else:
+            with open(options['path'], newline='',
+                      encoding='utf-8') as stream:
+                self.load(stream, options)
+
+    def load(self, stream, options):
+        started = time.monotonic()
+        created = skipped = 0
+        rows = read_rows(stream, options['format'])
+        for created, skipped in import_rows(rows, options['batch_size']):
+            elapsed = time.monotonic() - started
+            self.stderr.write(
+                f'\rЗагружено: {created}, пропущено: {skipped}, '
+                f'{created / max(elapsed, 1e-6):.0f} строк/с',
+                ending=''
+            )
+        elapsed = time.monotonic() - started
+        self.stderr.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено постов: {created}, пропущено: {skipped} '
+            f'за {elapsed:.1f} с ({created / max(elapsed, 1e-6):.0f} строк/с)'
+        ))
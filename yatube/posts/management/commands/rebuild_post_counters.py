@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов авторов и групп с нуля'
+
+    def handle(self, *args, **options):
+        authors, groups = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано: авторов {authors}, групп {groups}'
+        ))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from posts import tasks
+from posts.models import Post
+from posts.rendering import RENDERER_VERSION
+
+
+class Command(BaseCommand):
+    help = (
+        'Ставит в очередь пересчёт text_html/excerpt_html постов, '
+        'отрисованных прежней версией posts.rendering'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перерисовать все посты, а не только устаревшие'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('pk')
+        if not options['all']:
+            posts = posts.exclude(render_version=RENDERER_VERSION)
+        post_ids = posts.values_list('pk', flat=True)
+        total = 0
+        # задачи по POST_IDS_PER_TASK постов выполнит воркер run_tasks
+        for chunk in tasks.chunked(post_ids.iterator()):
+            tasks.rerender_posts.delay(chunk)
+            total += len(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f'Постов на перерисовку: {total}, версия рендера '
+            f'{RENDERER_VERSION}'
+        ))
@@ -0,0 +1,118 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from posts.models import Group, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует пользователей, группы и посты bulk-вставками '
+        'для нагрузочных замеров'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько дней разбросать даты публикации'
+        )
+        parser.add_argument(
+            '--prefix', default='bench',
+            help='Префикс username и slug, чтобы не пересекаться с данными'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Seed для повторяемых данных'
+        )
+
+    def handle(self, *args, **options):
+        fake = Faker('ru_RU')
+        if options['seed'] is not None:
+            Faker.seed(options['seed'])
+            random.seed(options['seed'])
+        started = time.monotonic()
+        author_ids = self.create_users(fake, options)
+        group_ids = self.create_groups(fake, options)
+        self.create_posts(fake, author_ids, group_ids, options)
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.monotonic() - started:.1f} с'
+        ))
+
+    def create_users(self, fake, options):
+        prefix = options['prefix']
+        offset = User.objects.filter(username__startswith=prefix).count()
+        User.objects.bulk_create(
+            (
+                User(
+                    username=f'{prefix}_user_{offset + number}',
+                    first_name=fake.first_name(),
+                    last_name=fake.last_name(),
+                    # вход по паролю для сгенерированных пользователей закрыт
+                    password='!',
+                )
+                for number in range(options['users'])
+            ),
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(f'Пользователей: {options["users"]}')
+        return list(User.objects.filter(
+            username__startswith=f'{prefix}_user_'
+        ).values_list('pk', flat=True))
+
+    def create_groups(self, fake, options):
+        prefix = options['prefix']
+        offset = Group.objects.filter(slug__startswith=prefix).count()
+        Group.objects.bulk_create(
+            (
+                Group(
+                    title=fake.catch_phrase()[:200],
+                    slug=f'{prefix}-group-{offset + number}',
+                    description=fake.paragraph(),
+                )
+                for number in range(options['groups'])
+            ),
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(f'Групп: {options["groups"]}')
+        return list(Group.objects.filter(
+            slug__startswith=f'{prefix}-group-'
+        ).values_list('pk', flat=True))
+
+    def create_posts(self, fake, author_ids, group_ids, options):
+        now = timezone.now()
+        span = timedelta(days=options['days']).total_seconds()
+        batch_size = options['batch_size']
+        # каждый третий пост без группы, как в живых данных
+        group_choices = group_ids + [None] * (len(group_ids) // 2 or 1)
+        created = 0
+        started = time.monotonic()
+        while created < options['posts']:
+            size = min(batch_size, options['posts'] - created)
+            batch = [
+                Post(
+                    text=fake.paragraph(nb_sentences=random.randint(1, 12)),
+                    pub_date=now - timedelta(seconds=random.random() * span),
+                    author_id=random.choice(author_ids),
+                    group_id=random.choice(group_choices),
+                )
+                for _ in range(size)
+            ]
+            with transaction.atomic():
+                Post.objects.bulk_create(batch, keep_pub_date=True)
+            created += size
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'\rПостов: {created} '
+                f'({created / max(elapsed, 1e-6):.0f} строк/с)',
+                ending=''
+            )
+        self.stdout.write('')
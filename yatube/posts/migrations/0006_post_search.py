@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# полнотекстовый индекс есть только на SQLite (FTS5); на других СУБД
+# posts.search берёт DatabaseSearchBackend
+CREATE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_post_fts USING fts5("
+    "text, group_id UNINDEXED, author_id UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+FILL_FTS = (
+    'INSERT INTO posts_post_fts(rowid, text, group_id, author_id) '
+    'SELECT id, text, group_id, author_id FROM posts_post'
+)
+DROP_FTS = 'DROP TABLE IF EXISTS posts_post_fts'
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(CREATE_FTS)
+        schema_editor.execute(FILL_FTS)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(DROP_FTS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:01
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+
+
+def render_html(apps, schema_editor):
+    # версия 1 posts.rendering; дальнейшие версии - manage.py rerender_posts
+    Post = apps.get_model('posts', 'Post')
+    batch = []
+    posts = Post.objects.only('pk', 'text', 'excerpt')
+    for post in posts.iterator(chunk_size=1000):
+        post.text_html = linebreaks(post.text, autoescape=True)
+        post.excerpt_html = linebreaks(post.excerpt, autoescape=True)
+        post.render_version = 1
+        batch.append(post)
+        if len(batch) == 1000:
+            Post.objects.bulk_update(
+                batch, ['text_html', 'excerpt_html', 'render_version']
+            )
+            batch = []
+    Post.objects.bulk_update(
+        batch, ['text_html', 'excerpt_html', 'render_version']
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='HTML превью'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='render_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Версия рендера'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='HTML текста'),
+        ),
+        migrations.RunPython(render_html, migrations.RunPython.noop),
+    ]
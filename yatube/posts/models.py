@@ -1,32 +1,145 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.urls import reverse
+from django.utils.text import Truncator
+
+from . import rendering
 
 User = get_user_model()
 
+# bulk_create не вызывает post_save: об оптовой вставке сообщаем отдельно
+posts_bulk_created = Signal(providing_args=['objs'])
+
 MAX_LENGTH_TEXT = 200
+# поля, которые пересчитываются из text при сохранении поста
+TEXT_DERIVED_FIELDS = (
+    'excerpt', 'text_html', 'excerpt_html', 'render_version'
+)
+# длина превью поста в лентах, символов
+EXCERPT_LENGTH = 300
+
+# колонки автора, которые не нужны шаблонам лент
+FEED_DEFERRED_AUTHOR_FIELDS = (
+    'author__password',
+    'author__last_login',
+    'author__is_superuser',
+    'author__email',
+    'author__is_staff',
+    'author__is_active',
+    'author__date_joined',
+)
 
 
 class Group(models.Model):
     title = models.CharField(max_length=MAX_LENGTH_TEXT)
     slug = models.SlugField(unique=True)
     description = models.TextField()
+    posts_count = models.PositiveIntegerField(
+        'Число постов',
+        default=0,
+        editable=False
+    )
 
     def __str__(self):
         return self.title
 
 
+def make_excerpt(text):
+    return Truncator(text).chars(EXCERPT_LENGTH)
+
+
+class PostQuerySet(models.QuerySet):
+    def with_related(self):
+        """Автор и группа одним JOIN вместо N+1."""
+        return self.select_related('author', 'group').defer(
+            *FEED_DEFERRED_AUTHOR_FIELDS
+        )
+
+    def feed(self):
+        """Посты для лент: без полного текста, ленты выводят
+        excerpt_html."""
+        return self.with_related().defer('text', 'text_html', 'excerpt')
+
+    def bulk_create(self, objs, *args, keep_pub_date=False, **kwargs):
+        """keep_pub_date=True сохраняет переданные pub_date постов.
+
+        auto_now_add ставит при вставке текущее время, поэтому исходные
+        даты (импорт, seed_benchmark) возвращаются одним UPDATE в той же
+        транзакции, до posts_bulk_created.
+        """
+        objs = list(objs)
+        for obj in objs:
+            obj.excerpt = make_excerpt(obj.text)
+            rendering.render_post(obj)
+        pub_dates = [obj.pub_date for obj in objs]
+        base = self.model._base_manager.using(self.db)
+        with transaction.atomic(using=self.db, savepoint=False):
+            last_pk = base.aggregate(last=models.Max('pk'))['last'] or 0
+            objs = super().bulk_create(objs, *args, **kwargs)
+            if objs and objs[0].pk is None:
+                # SQLite не возвращает pk из bulk_create: новые строки
+                # идут после last_pk в порядке вставки
+                pks = list(base.filter(pk__gt=last_pk).order_by('pk')
+                           .values_list('pk', flat=True))
+                if len(pks) == len(objs):
+                    for obj, pk in zip(objs, pks):
+                        obj.pk = pk
+            if keep_pub_date:
+                kept = []
+                for obj, pub_date in zip(objs, pub_dates):
+                    if pub_date is not None and obj.pk is not None:
+                        obj.pub_date = pub_date
+                        kept.append(obj)
+                base.bulk_update(kept, ['pub_date'])
+        posts_bulk_created.send(sender=self.model, objs=objs)
+        return objs
+
+
 class Post(models.Model):
     text = models.TextField(
         'Текст поста',
         help_text='Введите текст поста'
     )
+    excerpt = models.CharField(
+        'Превью',
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False
+    )
+    # HTML текста и превью считается один раз при сохранении, а не при
+    # каждом рендере; render_version - версия posts.rendering
+    text_html = models.TextField('HTML текста', blank=True, editable=False)
+    excerpt_html = models.TextField(
+        'HTML превью',
+        blank=True,
+        editable=False
+    )
+    render_version = models.PositiveSmallIntegerField(
+        'Версия рендера',
+        default=0,
+        editable=False
+    )
+    # миниатюры для лент и страницы поста готовит задача
+    # posts.tasks.generate_thumbnails, см. posts.thumbnails
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        blank=True,
+        help_text='Картинка к посту'
+    )
     pub_date = models.DateTimeField(
         'Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Автор',
         related_name='posts'
     )
@@ -35,13 +148,137 @@ class Post(models.Model):
         blank=True,
         null=True,
         on_delete=models.SET_NULL,
+        db_index=False,
         verbose_name='Группа',
         help_text='Группа, к которой будет относиться пост',
         related_name='posts'
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
-        ordering = ['-pub_date']
+        ordering = ['-pub_date', '-id']
+        # индексы под три ленты: index, profile, group_list;
+        # id - тай-брейк для одинаковых pub_date и курсорной пагинации
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_feed_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_feed_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+    def get_absolute_url(self):
+        return reverse('posts:post_detail', args=[self.pk])
+
+    def save(self, *args, **kwargs):
+        # превью и HTML обновляются вместе с текстом; пост из ленты
+        # (text отложен и не загружен) текст не меняет, их тоже
+        if 'text' in self.__dict__:
+            self.excerpt = make_excerpt(self.text)
+            rendering.render_post(self)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'text' in update_fields:
+                kwargs['update_fields'] = {
+                    *update_fields, *TEXT_DERIVED_FIELDS
+                }
+        super().save(*args, **kwargs)
+
+
+class AuthorStats(models.Model):
+    """Денормализованные счётчики автора, пересчитываются сигналами."""
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Автор',
+        related_name='stats'
+    )
+    posts_count = models.PositiveIntegerField('Число постов', default=0)
+    followers_count = models.PositiveIntegerField(
+        'Число подписчиков',
+        default=0
+    )
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Подписчик',
+        related_name='follower'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Автор',
+        related_name='following'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'],
+                name='unique_follow'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='no_self_follow'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user} -> {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """Строка материализованной ленты подписок: пост в ленте читателя.
+
+    pub_date копируется из поста, чтобы лента читалась одним проходом
+    по индексу (user, -pub_date) без обращения к таблице постов.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Читатель',
+        related_name='timeline'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Пост',
+        related_name='timeline_entries'
+    )
+    pub_date = models.DateTimeField('Дата публикации')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'],
+                name='unique_timeline_post'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date', '-post'],
+                name='timeline_user_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user}: {self.post_id}'
@@ -0,0 +1,17 @@
+from django.utils.html import linebreaks
+
+# увеличьте при любом изменении render_text: manage.py rerender_posts
+# перерисует сохранённый HTML постов с прежней версией
+RENDERER_VERSION = 1
+
+
+def render_text(text):
+    """HTML тела поста: экранирование и абзацы, как фильтр linebreaks."""
+    return linebreaks(text, autoescape=True)
+
+
+def render_post(post):
+    """Заполняет text_html и excerpt_html; excerpt должен быть готов."""
+    post.text_html = render_text(post.text)
+    post.excerpt_html = render_text(post.excerpt)
+    post.render_version = RENDERER_VERSION
@@ -0,0 +1,200 @@
+import base64
+import binascii
+import json
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .models import Post
+from .utils import CursorPage
+
+SQLITE_BACKEND = 'posts.search.SQLiteFTSBackend'
+DATABASE_BACKEND = 'posts.search.DatabaseSearchBackend'
+
+TERM_RE = re.compile(r'\w+')
+
+
+def get_backend():
+    """Бэкенд из POSTS_SEARCH_BACKEND, по умолчанию - по вендору БД."""
+    path = settings.POSTS_SEARCH_BACKEND
+    if path is None:
+        path = (
+            SQLITE_BACKEND if connection.vendor == 'sqlite'
+            else DATABASE_BACKEND
+        )
+    return import_string(path)()
+
+
+def parse_terms(query):
+    return TERM_RE.findall(query.lower())
+
+
+class BaseSearchBackend:
+    """Интерфейс поискового индекса постов.
+
+    Результаты упорядочены по (rank, -pk): меньший rank - выше
+    релевантность. Пара (rank, pk) последней строки служит курсором.
+    """
+
+    def index(self, posts):
+        raise NotImplementedError
+
+    def remove(self, post_ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, query, group_id=None, author_id=None, after=None,
+               limit=None):
+        """Список (post_id, rank) по релевантности."""
+        raise NotImplementedError
+
+    def rebuild(self, batch_size=1000):
+        self.clear()
+        total = 0
+        batch = []
+        posts = Post.objects.order_by().only(
+            'pk', 'text', 'author_id', 'group_id'
+        )
+        for post in posts.iterator(chunk_size=batch_size):
+            batch.append(post)
+            if len(batch) == batch_size:
+                self.index(batch)
+                total += len(batch)
+                batch = []
+        self.index(batch)
+        return total + len(batch)
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """Инвертированный индекс SQLite FTS5, таблица из миграции 0006."""
+    table = 'posts_post_fts'
+
+    @staticmethod
+    def match_expression(terms):
+        # каждое слово - префиксный токен: "пост"* найдёт и "поста"
+        return ' '.join('"{}"*'.format(term) for term in terms)
+
+    def index(self, posts):
+        posts = [post for post in posts if post.pk is not None]
+        if not posts:
+            return
+        self.remove(post.pk for post in posts)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table}(rowid, text, group_id, author_id) '
+                'VALUES (%s, %s, %s, %s)',
+                [
+                    (post.pk, post.text, post.group_id, post.author_id)
+                    for post in posts
+                ]
+            )
+
+    def remove(self, post_ids):
+        post_ids = list(post_ids)
+        if not post_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(post_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid IN ({placeholders})',
+                post_ids
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+
+    def search(self, query, group_id=None, author_id=None, after=None,
+               limit=None):
+        terms = parse_terms(query)
+        if not terms:
+            return []
+        sql = [f'SELECT rowid, rank FROM {self.table} WHERE {self.table} '
+               'MATCH %s']
+        params = [self.match_expression(terms)]
+        if group_id is not None:
+            sql.append('AND group_id = %s')
+            params.append(group_id)
+        if author_id is not None:
+            sql.append('AND author_id = %s')
+            params.append(author_id)
+        if after is not None:
+            rank, pk = after
+            sql.append('AND (rank > %s OR (rank = %s AND rowid < %s))')
+            params.extend([rank, rank, pk])
+        sql.append('ORDER BY rank, rowid DESC')
+        if limit is not None:
+            sql.append('LIMIT %s')
+            params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(' '.join(sql), params)
+            return cursor.fetchall()
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Запасной вариант без индекса: icontains по каждому слову."""
+
+    def index(self, posts):
+        pass
+
+    def remove(self, post_ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def rebuild(self, batch_size=1000):
+        return 0
+
+    def search(self, query, group_id=None, author_id=None, after=None,
+               limit=None):
+        terms = parse_terms(query)
+        if not terms:
+            return []
+        posts = Post.objects.order_by('-pk')
+        for term in terms:
+            posts = posts.filter(text__icontains=term)
+        if group_id is not None:
+            posts = posts.filter(group_id=group_id)
+        if author_id is not None:
+            posts = posts.filter(author_id=author_id)
+        if after is not None:
+            posts = posts.filter(pk__lt=after[1])
+        ids = posts.values_list('pk', flat=True)
+        if limit is not None:
+            ids = ids[:limit]
+        return [(pk, 0) for pk in ids]
+
+
+def encode_cursor(rank, pk):
+    return base64.urlsafe_b64encode(json.dumps([rank, pk]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        rank, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(pk)
+    except (binascii.Error, TypeError, ValueError, AttributeError):
+        return None
+
+
+def search_page(query, per_page, cursor=None, group_id=None,
+                author_id=None):
+    """Страница результатов с курсором на следующую, как CursorPage."""
+    after = decode_cursor(cursor) if cursor else None
+    if after is None:
+        cursor = None
+    hits = get_backend().search(
+        query, group_id, author_id, after=after, limit=per_page + 1
+    )
+    next_cursor = None
+    if len(hits) > per_page:
+        hits = hits[:per_page]
+        next_cursor = encode_cursor(hits[-1][1], hits[-1][0])
+    posts = Post.objects.feed().in_bulk([pk for pk, _ in hits])
+    rows = [posts[pk] for pk, _ in hits if pk in posts]
+    return CursorPage(rows, cursor, next_cursor, None)
@@ -0,0 +1,116 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import counters, feed_cache, tasks
+from .models import Follow, Group, Post, User, posts_bulk_created
+
+# поля автора, которые видны в его постах во всех лентах
+AUTHOR_NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+def remember_state(post):
+    # значения на момент загрузки: по ним видно смену группы при save()
+    post._saved_author_id = post.__dict__.get('author_id')
+    post._saved_group_id = post.__dict__.get('group_id')
+    post._saved_image = image_name(post)
+
+
+def image_name(post):
+    # до первого обращения к полю в __dict__ лежит строка, после - FieldFile
+    image = post.__dict__.get('image')
+    return getattr(image, 'name', image) or None
+
+
+@receiver(post_init, sender=Post)
+def post_loaded(sender, instance, **kwargs):
+    remember_state(instance)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.change_author_count(instance.author_id, 1)
+        counters.change_group_count(instance.group_id, 1)
+        tasks.post_created([instance.pk])
+        tasks.notify_followers.delay(instance.pk)
+    else:
+        if instance.author_id != instance._saved_author_id:
+            counters.change_author_count(instance._saved_author_id, -1)
+            counters.change_author_count(instance.author_id, 1)
+        if instance.group_id != instance._saved_group_id:
+            counters.change_group_count(instance._saved_group_id, -1)
+            counters.change_group_count(instance.group_id, 1)
+    feed_cache.invalidate(feed_cache.post_feed_keys(
+        {instance.author_id, instance._saved_author_id} - {None},
+        {instance.group_id, instance._saved_group_id}
+    ))
+    if not created:
+        tasks.index_posts.delay([instance.pk])
+    if image_name(instance) not in (None, instance._saved_image):
+        tasks.generate_thumbnails.delay([instance.pk])
+    remember_state(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    counters.change_author_count(instance.author_id, -1)
+    counters.change_group_count(instance.group_id, -1)
+    feed_cache.invalidate(feed_cache.post_feed_keys(
+        {instance.author_id}, {instance.group_id}
+    ))
+    tasks.remove_posts.delay([instance.pk])
+
+
+@receiver(posts_bulk_created, sender=Post)
+def posts_created(sender, objs, **kwargs):
+    counters.apply_bulk_counts(objs)
+    feed_cache.invalidate(feed_cache.post_feed_keys(
+        {post.author_id for post in objs},
+        {post.group_id for post in objs}
+    ))
+    tasks.post_created(post.pk for post in objs if post.pk is not None)
+    with_images = [post.pk for post in objs if post.pk and post.image]
+    for chunk in tasks.chunked(with_images):
+        tasks.generate_thumbnails.delay(chunk)
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, **kwargs):
+    # название группы выводится и в общей ленте
+    feed_cache.invalidate(feed_cache.post_feed_keys((), {instance.pk}))
+
+
+@receiver(post_save, sender=User)
+def author_saved(sender, instance, created, update_fields, **kwargs):
+    # вход пишет только last_login: ленты от этого не меняются
+    if created or (
+        update_fields is not None
+        and not AUTHOR_NAME_FIELDS.intersection(update_fields)
+    ):
+        return
+    group_ids = set(
+        Post.objects.filter(author_id=instance.pk).order_by()
+        .values_list('group_id', flat=True).distinct()
+    )
+    feed_cache.invalidate(
+        feed_cache.post_feed_keys({instance.pk}, group_ids)
+    )
+
+
+# followers_count держат сигналы, а не posts.timeline: так его обновляют
+# и каскадное удаление подписчика, и удаление подписок в админке
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.change_followers_count(instance.author_id, 1)
+        feed_cache.invalidate({
+            feed_cache.follow_key(instance.user_id, instance.author_id)
+        })
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    counters.change_followers_count(instance.author_id, -1)
+    feed_cache.invalidate({
+        feed_cache.follow_key(instance.user_id, instance.author_id)
+    })
@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.urls import reverse
+
+from core.tasks import task
+
+from . import (estimates, feed_cache, rendering, search, thumbnails,
+               timeline)
+from .models import Follow, Post
+
+# сколько pk постов передавать одной задаче при bulk_create
+POST_IDS_PER_TASK = 1000
+
+
+def chunked(post_ids):
+    post_ids = list(post_ids)
+    for start in range(0, len(post_ids), POST_IDS_PER_TASK):
+        yield post_ids[start:start + POST_IDS_PER_TASK]
+
+
+@task
+def index_posts(post_ids):
+    search.get_backend().index(
+        Post.objects.filter(pk__in=post_ids).only(
+            'pk', 'text', 'author_id', 'group_id'
+        )
+    )
+
+
+@task
+def remove_posts(post_ids):
+    search.get_backend().remove(post_ids)
+
+
+@task
+def fan_out_posts(post_ids):
+    timeline.fan_out(
+        Post.objects.filter(pk__in=post_ids).only(
+            'pk', 'author_id', 'pub_date'
+        )
+    )
+
+
+@task
+def notify_followers(post_id):
+    post = Post.objects.select_related('author').filter(pk=post_id).first()
+    if post is None:
+        return
+    emails = Follow.objects.filter(author_id=post.author_id).exclude(
+        user__email=''
+    ).values_list('user__email', flat=True)
+    subject = f'Новый пост: {post.author.get_full_name() or post.author}'
+    body = '{}\n\n{}'.format(
+        post.text, reverse('posts:post_detail', args=[post.pk])
+    )
+    send_mass_mail(
+        (subject, body, settings.DEFAULT_FROM_EMAIL, [email])
+        for email in emails.iterator()
+    )
+
+
+@task
+def rerender_posts(post_ids):
+    """Пересчитывает сохранённый HTML постов текущим рендером."""
+    posts = list(Post.objects.filter(pk__in=post_ids).only(
+        'pk', 'text', 'excerpt', 'author_id', 'group_id'
+    ))
+    for post in posts:
+        rendering.render_post(post)
+    # bulk_update не трогает updated_at: текст поста не менялся
+    Post.objects.bulk_update(
+        posts, ['text_html', 'excerpt_html', 'render_version']
+    )
+    feed_cache.invalidate(feed_cache.post_feed_keys(
+        {post.author_id for post in posts},
+        {post.group_id for post in posts}
+    ))
+
+
+@task
+def generate_thumbnails(post_ids):
+    """Готовит миниатюры картинок постов вне цикла запроса."""
+    posts = list(Post.objects.filter(pk__in=post_ids).exclude(
+        image=''
+    ).only('pk', 'image', 'author_id', 'group_id'))
+    for post in posts:
+        thumbnails.generate(post.image)
+    # в кэше лент лежат страницы с исходной картинкой вместо миниатюры
+    feed_cache.invalidate(feed_cache.post_feed_keys(
+        {post.author_id for post in posts},
+        {post.group_id for post in posts}
+    ))
+
+
+@task
+def refresh_post_count_estimate():
+    estimates.refresh()
+
+
+def post_created(post_ids):
+    """Побочные эффекты новых постов, которым не место в запросе."""
+    for chunk in chunked(post_ids):
+        index_posts.delay(chunk)
+        fan_out_posts.delay(chunk)
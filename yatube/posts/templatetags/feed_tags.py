@@ -0,0 +1,43 @@
+from django import template
+
+from posts import feed_cache
+
+register = template.Library()
+
+
+class FeedCacheNode(template.Node):
+    def __init__(self, nodelist, feed_key, page_obj):
+        self.nodelist = nodelist
+        self.feed_key = feed_key
+        self.page_obj = page_obj
+
+    def render(self, context):
+        key = feed_cache.fragment_key(
+            self.feed_key.resolve(context),
+            self.page_obj.resolve(context)
+        )
+        html = feed_cache.get_fragment(key)
+        if html is None:
+            html = self.nodelist.render(context)
+            feed_cache.set_fragment(key, html)
+        return html
+
+
+@register.tag
+def cachefeed(parser, token):
+    """{% cachefeed feed_key page_obj %}...{% endcachefeed %}
+
+    Кэширует отрендеренную страницу ленты до записи в эту ленту.
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(
+            f'{bits[0]} ожидает feed_key и page_obj'
+        )
+    nodelist = parser.parse(('endcachefeed',))
+    parser.delete_first_token()
+    return FeedCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2])
+    )
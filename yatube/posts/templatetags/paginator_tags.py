@@ -0,0 +1,17 @@
+from django import template
+
+from posts.utils import elided_page_range
+
+register = template.Library()
+
+
+@register.simple_tag
+def elided_pages(page_obj, on_each_side=2, on_ends=1):
+    """{% elided_pages page_obj as pages %}: номера страниц с пропусками.
+
+    Вместо всего page_range - первая и последняя страницы и окно вокруг
+    текущей, так что размер пагинатора не растёт вместе с лентой.
+    """
+    return list(elided_page_range(
+        page_obj.number, page_obj.paginator.num_pages, on_each_side, on_ends
+    ))
@@ -0,0 +1,15 @@
+from django import template
+
+from posts import thumbnails
+
+register = template.Library()
+
+
+@register.simple_tag
+def cached_thumbnail(image, size):
+    """Готовая миниатюра размера из POSTS_THUMBNAIL_SIZES или None.
+
+    В отличие от {% thumbnail %} из sorl-thumbnail никогда не ресайзит
+    картинку в запросе: миниатюры готовит задача generate_thumbnails.
+    """
+    return thumbnails.lookup(image, size)
@@ -6,6 +6,12 @@ NUM_COUNT_POST_THREE = 3
 NUM_COUNT_POST_TEN = 10
 NUM_TOTAL_POSTS = 13
 
+# бюджет SQL-запросов на страницу ленты (не зависит от числа постов)
+QUERY_BUDGET_INDEX = 2
+QUERY_BUDGET_GROUP_LIST = 3
+QUERY_BUDGET_PROFILE = 3
+QUERY_BUDGET_POST_DETAIL = 1
+
 STR_USERNAME = 'User_test'
 STR_OTHER_USER = 'other_user'
 STR_TEXT = 'text_test'
@@ -33,3 +39,7 @@ URL_GROUP_LIST = 'posts:group_list'
 URL_INDEX_REV = reverse(URL_INDEX)
 URL_PROFILE_REV = reverse(URL_PROFILE, kwargs={'username': STR_USERNAME})
 URL_POST_CREATE_REV = reverse('posts:post_create')
+URL_FOLLOW_INDEX_REV = reverse('posts:follow_index')
+URL_PROFILE_FOLLOW = 'posts:profile_follow'
+URL_PROFILE_UNFOLLOW = 'posts:profile_unfollow'
+TEMPLATE_FOLLOW = 'posts/follow.html'
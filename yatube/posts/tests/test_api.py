@@ -0,0 +1,96 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.tests import const
+
+URL_API_POSTS = reverse('api:post_list')
+
+
+class PostApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        Post.objects.bulk_create(
+            Post(text=f'{const.STR_TEXT} {number}', author=cls.user,
+                 group=cls.group)
+            for number in range(const.NUM_TOTAL_POSTS)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_cursor_pagination(self):
+        """Проверка: лента API листается курсором без повторов"""
+        response = self.client.get(URL_API_POSTS)
+        data = response.json()
+        self.assertEqual(len(data['results']), const.NUM_COUNT_POST_TEN)
+        self.assertIsNone(data['previous'])
+        second = self.client.get(data['next']).json()
+        self.assertEqual(
+            len(second['results']),
+            const.NUM_TOTAL_POSTS - const.NUM_COUNT_POST_TEN
+        )
+        self.assertIsNone(second['next'])
+        ids = [row['id'] for row in data['results'] + second['results']]
+        self.assertEqual(
+            ids,
+            list(Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True
+            ))
+        )
+
+    def test_sparse_fields(self):
+        """Проверка: ?fields= выбирает поля и колонки запроса"""
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                URL_API_POSTS, {'fields': 'id,author'}
+            )
+        row = response.json()['results'][0]
+        self.assertEqual(set(row), {'id', 'author'})
+        self.assertEqual(row['author'], const.STR_USERNAME)
+        response = self.client.get(URL_API_POSTS, {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_group_profile_and_detail(self):
+        """Проверка: лента группы, профиль и пост отдаются в JSON"""
+        group = self.client.get(
+            reverse('api:group_list', args=[self.group.slug])
+        ).json()
+        self.assertEqual(group['group']['title'], const.STR_GROUP1_TITLE)
+        self.assertEqual(
+            group['results'][0]['group'], const.STR_GROUP1_SLUG
+        )
+        profile = self.client.get(
+            reverse('api:profile', args=[const.STR_USERNAME])
+        ).json()
+        self.assertEqual(
+            profile['author']['posts_count'], const.NUM_TOTAL_POSTS
+        )
+        post = Post.objects.order_by('pk').first()
+        detail = self.client.get(
+            reverse('api:post_detail', args=[post.pk]),
+            {'fields': 'text,html'}
+        ).json()
+        self.assertEqual(
+            detail, {'text': post.text, 'html': post.text_html}
+        )
+        response = self.client.get(reverse('api:post_detail', args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_etag_follows_feed_version(self):
+        """Проверка: ETag ленты меняется только с новым постом"""
+        etag = self.client.get(URL_API_POSTS)['ETag']
+        response = self.client.get(URL_API_POSTS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Post.objects.create(text=const.STR_TEXT, author=self.user)
+        response = self.client.get(URL_API_POSTS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,227 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import feed_cache
+from posts.models import Follow, Group, Post, User
+from posts.tests import const
+from yatube.settings.prod import CACHES as PROD_CACHES
+
+STR_NEW_TEXT = 'new_text_test'
+
+
+class FeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        cls.group2 = Group.objects.create(
+            title=const.STR_GROUP2_TITLE,
+            slug=const.STR_GROUP2_SLUG,
+            description=const.STR_GROUP2_DESCRIPTION,
+        )
+        cls.post = Post.objects.create(
+            text=const.STR_TEXT,
+            author=cls.user,
+            group=cls.group,
+        )
+        cls.GROUP_LIST = reverse(
+            const.URL_GROUP_LIST,
+            kwargs={'slug': cls.group.slug}
+        )
+        cls.GROUP_LIST_GROUP_2 = reverse(
+            const.URL_GROUP_LIST,
+            kwargs={'slug': cls.group2.slug}
+        )
+        cls.POST_EDIT = reverse(
+            const.URL_POST_EDIT,
+            kwargs={'post_id': cls.post.pk}
+        )
+        cls.FEEDS = (const.URL_INDEX_HOME, cls.GROUP_LIST,
+                     const.URL_PROFILE_REV)
+
+    def setUp(self):
+        cache.clear()
+        self.guest = Client()
+        self.author = Client()
+        self.author.force_login(self.user)
+
+    def test_second_render_is_cache_hit(self):
+        """Проверка: повторный запрос ленты берёт страницу из кэша"""
+        for url in self.FEEDS:
+            with self.subTest(url=url):
+                before = feed_cache.stats()
+                first = self.guest.get(url).content
+                # число постов тоже из кэша: остаётся только группа/автор
+                with self.assertNumQueries(1 if url != '/' else 0):
+                    second = self.guest.get(url).content
+                self.assertEqual(first, second)
+                after = feed_cache.stats()
+                self.assertEqual(after['misses'], before['misses'] + 1)
+                self.assertEqual(after['hits'], before['hits'] + 1)
+
+    def test_prod_cache_shared_between_workers(self):
+        """Проверка: в prod кэш лент общий для процессов, не LocMem"""
+        self.assertEqual(
+            PROD_CACHES['default']['BACKEND'],
+            'django.core.cache.backends.filebased.FileBasedCache'
+        )
+        self.assertTrue(PROD_CACHES['default']['LOCATION'])
+
+    def test_create_invalidates_feeds(self):
+        """Проверка: новый пост сразу виден во всех своих лентах"""
+        for url in self.FEEDS:
+            self.guest.get(url)
+        Post.objects.create(
+            text=STR_NEW_TEXT, author=self.user, group=self.group
+        )
+        for url in self.FEEDS:
+            with self.subTest(url=url):
+                self.assertContains(self.guest.get(url), STR_NEW_TEXT)
+
+    def test_edit_and_regroup_invalidate_feeds(self):
+        """Проверка: post_edit со сменой группы обновляет обе группы"""
+        for url in self.FEEDS + (self.GROUP_LIST_GROUP_2,):
+            self.guest.get(url)
+        self.author.post(
+            self.POST_EDIT,
+            data={'text': STR_NEW_TEXT, 'group': self.group2.pk}
+        )
+        self.assertNotContains(self.guest.get(self.GROUP_LIST), STR_NEW_TEXT)
+        for url in (const.URL_INDEX_HOME, const.URL_PROFILE_REV,
+                    self.GROUP_LIST_GROUP_2):
+            with self.subTest(url=url):
+                self.assertContains(self.guest.get(url), STR_NEW_TEXT)
+
+    def test_delete_invalidates_feeds(self):
+        """Проверка: удалённый пост пропадает из закэшированных лент"""
+        for url in self.FEEDS:
+            self.assertContains(self.guest.get(url), const.STR_TEXT)
+        Post.objects.get(pk=self.post.pk).delete()
+        for url in self.FEEDS:
+            with self.subTest(url=url):
+                self.assertNotContains(self.guest.get(url), const.STR_TEXT)
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.post = Post.objects.create(text=const.STR_TEXT, author=cls.user)
+        cls.POST_DETAIL = reverse(
+            const.URL_POST_DETAIL,
+            kwargs={'post_id': cls.post.pk}
+        )
+        cls.POST_EDIT = reverse(
+            const.URL_POST_EDIT,
+            kwargs={'post_id': cls.post.pk}
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest = Client()
+        self.author = Client()
+        self.author.force_login(self.user)
+
+    def test_post_detail_not_modified(self):
+        """Проверка: post_detail отвечает 304 по ETag и Last-Modified"""
+        response = self.guest.get(self.POST_DETAIL)
+        for headers in (
+            {'HTTP_IF_NONE_MATCH': response['ETag']},
+            {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+        ):
+            with self.subTest(headers=headers):
+                cached = self.guest.get(self.POST_DETAIL, **headers)
+                self.assertEqual(cached.status_code, HTTPStatus.NOT_MODIFIED)
+                self.assertFalse(cached.templates)
+
+    def test_post_edit_changes_etag(self):
+        """Проверка: post_edit обновляет updated_at и ETag поста"""
+        etag = self.guest.get(self.POST_DETAIL)['ETag']
+        updated_at = Post.objects.get(pk=self.post.pk).updated_at
+        self.author.post(self.POST_EDIT, data={'text': STR_NEW_TEXT})
+        self.assertGreater(
+            Post.objects.get(pk=self.post.pk).updated_at, updated_at
+        )
+        response = self.guest.get(self.POST_DETAIL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_feed_not_modified_until_new_post(self):
+        """Проверка: лента отвечает 304, пока в ней нет новых постов"""
+        etag = self.guest.get(const.URL_INDEX_HOME)['ETag']
+        response = self.guest.get(
+            const.URL_INDEX_HOME, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Post.objects.create(text=STR_NEW_TEXT, author=self.user)
+        response = self.guest.get(
+            const.URL_INDEX_HOME, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_depends_on_user(self):
+        """Проверка: гость и автор получают разные ETag"""
+        for url in (const.URL_INDEX_HOME, self.POST_DETAIL):
+            with self.subTest(url=url):
+                self.assertNotEqual(
+                    self.guest.get(url)['ETag'],
+                    self.author.get(url)['ETag']
+                )
+
+    def test_profile_not_modified_without_follow_query(self):
+        """Проверка: 304 профиля не запрашивает подписку, подписка - 200"""
+        reader = User.objects.create_user(username=const.STR_OTHER_USER)
+        client = Client()
+        client.force_login(reader)
+        etag = client.get(const.URL_PROFILE_REV)['ETag']
+        # остаётся только автор профиля: сессия и пользователь в кэше
+        with self.assertNumQueries(1):
+            response = client.get(
+                const.URL_PROFILE_REV, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Follow.objects.create(user=reader, author=self.user)
+        response = client.get(const.URL_PROFILE_REV, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.context['following'])
+
+    def test_renames_change_etags(self):
+        """Проверка: смена имени автора и названия группы меняет ETag"""
+        group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE, slug=const.STR_GROUP1_SLUG
+        )
+        Post.objects.filter(pk=self.post.pk).update(group=group)
+        author = User.objects.get(pk=self.user.pk)
+        group_url = reverse(const.URL_GROUP_LIST, args=[group.slug])
+
+        def rename_author():
+            author.first_name = 'Новое имя'
+            author.save()
+
+        def rename_group():
+            group.title = 'Новое название'
+            group.save()
+
+        for rename, urls in (
+            (rename_author, (const.URL_INDEX_HOME, const.URL_PROFILE_REV,
+                             self.POST_DETAIL)),
+            (rename_group, (const.URL_INDEX_HOME, group_url,
+                            self.POST_DETAIL)),
+        ):
+            etags = {url: self.guest.get(url)['ETag'] for url in urls}
+            rename()
+            for url in urls:
+                with self.subTest(rename=rename.__name__, url=url):
+                    response = self.guest.get(
+                        url, HTTP_IF_NONE_MATCH=etags[url]
+                    )
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
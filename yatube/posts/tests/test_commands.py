@@ -0,0 +1,169 @@
+import json
+import tempfile
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from posts.counters import find_inconsistencies
+from posts.models import Group, Post, User
+from posts.rendering import RENDERER_VERSION
+from posts.tests import const
+
+
+class ExplainFeedsCommandTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        Post.objects.bulk_create(
+            Post(text=const.STR_TEXT, author=cls.user, group=cls.group)
+            for _ in range(const.NUM_TOTAL_POSTS)
+        )
+
+    def test_feeds_use_indexes(self):
+        """Проверка: ленты читаются по индексам, без сортировки в памяти"""
+        out = StringIO()
+        call_command('explain_feeds', stdout=out)
+        plans = out.getvalue()
+        for index_name in (
+            'post_feed_idx', 'post_author_feed_idx', 'post_group_feed_idx'
+        ):
+            with self.subTest(index_name=index_name):
+                self.assertIn(index_name, plans)
+
+
+class TransferPostsCommandTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        for number_post in range(const.NUM_TOTAL_POSTS):
+            Post.objects.create(
+                text=f'{const.STR_TEXT} {number_post}',
+                author=cls.user,
+                group=cls.group if number_post % 2 else None,
+            )
+
+    def test_export_import_round_trip(self):
+        """Проверка: export_posts и import_posts переносят посты целиком"""
+        for file_format in ('jsonl', 'csv'):
+            with self.subTest(file_format=file_format):
+                expected = sorted(Post.objects.values_list(
+                    'text', 'pub_date', 'author', 'group'
+                ))
+                with tempfile.NamedTemporaryFile(
+                    'w+', suffix=f'.{file_format}'
+                ) as dump:
+                    call_command(
+                        'export_posts', dump.name, format=file_format,
+                        stderr=StringIO()
+                    )
+                    Post.objects.all().delete()
+                    call_command(
+                        'import_posts', dump.name, format=file_format,
+                        batch_size=const.NUM_COUNT_POST_THREE,
+                        stdout=StringIO(), stderr=StringIO()
+                    )
+                self.assertEqual(sorted(Post.objects.values_list(
+                    'text', 'pub_date', 'author', 'group'
+                )), expected)
+                self.assertEqual(find_inconsistencies(), [])
+
+    def test_import_skips_unknown_authors(self):
+        """Проверка: строки с неизвестным автором пропускаются"""
+        rows = '\n'.join([
+            json.dumps({'text': const.STR_TEXT, 'author': 'nobody'}),
+            json.dumps({
+                'text': const.STR_TEXT,
+                'author': const.STR_USERNAME,
+                'group': const.STR_GROUP1_SLUG,
+            }),
+        ])
+        with tempfile.NamedTemporaryFile('w+', suffix='.jsonl') as dump:
+            dump.write(rows)
+            dump.flush()
+            out = StringIO()
+            call_command(
+                'import_posts', dump.name, stdout=out, stderr=StringIO()
+            )
+        self.assertIn('Загружено постов: 1, пропущено: 1', out.getvalue())
+        self.assertEqual(Post.objects.count(), const.NUM_TOTAL_POSTS + 1)
+
+    def test_import_skips_malformed_rows(self):
+        """Проверка: битые строки пропускаются, даты сохраняются"""
+        row = {'text': const.STR_TEXT, 'author': const.STR_USERNAME}
+        rows = '\n'.join([
+            json.dumps(dict(row, pub_date='2020-13-01T10:00:00')),
+            '{не json',
+            json.dumps([const.STR_TEXT]),
+            json.dumps(dict(row, text='старый пост',
+                            pub_date='2020-01-02T10:00:00')),
+        ])
+        with tempfile.NamedTemporaryFile('w+', suffix='.jsonl') as dump:
+            dump.write(rows)
+            dump.flush()
+            out = StringIO()
+            call_command(
+                'import_posts', dump.name, stdout=out, stderr=StringIO()
+            )
+        self.assertIn('Загружено постов: 1, пропущено: 3', out.getvalue())
+        post = Post.objects.get(text='старый пост')
+        self.assertEqual(
+            post.pub_date,
+            timezone.make_aware(datetime(2020, 1, 2, 10))
+        )
+
+
+class BenchmarkCommandsTest(TestCase):
+    def test_seed_and_benchmark(self):
+        """Проверка: seed_benchmark наполняет базу, а benchmark_views
+        пишет отчёт по всем страницам posts.urls"""
+        call_command(
+            'seed_benchmark', users=3, groups=2,
+            posts=const.NUM_TOTAL_POSTS, batch_size=5, seed=1,
+            stdout=StringIO()
+        )
+        self.assertEqual(Post.objects.count(), const.NUM_TOTAL_POSTS)
+        self.assertEqual(find_inconsistencies(), [])
+        with tempfile.NamedTemporaryFile('w+', suffix='.json') as output:
+            call_command(
+                'benchmark_views', repeat=2, output=output.name,
+                stdout=StringIO()
+            )
+            report = json.load(output)
+        self.assertEqual(report['posts'], const.NUM_TOTAL_POSTS)
+        for name in ('index', 'group_list', 'profile', 'post_detail',
+                     'post_create', 'post_edit', 'post_search'):
+            with self.subTest(name=name):
+                self.assertIn('p95_ms', report['views'][name])
+                self.assertIn('queries', report['views'][name])
+
+
+class RerenderPostsCommandTest(TestCase):
+    def test_rerender_stale_posts(self):
+        """Проверка: rerender_posts перерисовывает устаревший HTML"""
+        user = User.objects.create_user(username=const.STR_USERNAME)
+        post = Post.objects.create(text='<b>жирный</b>\n\nабзац', author=user)
+        expected = post.text_html
+        self.assertEqual(
+            expected, '<p>&lt;b&gt;жирный&lt;/b&gt;</p>\n\n<p>абзац</p>'
+        )
+        Post.objects.update(text_html='', excerpt_html='', render_version=0)
+        call_command('rerender_posts', stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, expected)
+        self.assertEqual(post.excerpt_html, expected)
+        self.assertEqual(post.render_version, RENDERER_VERSION)
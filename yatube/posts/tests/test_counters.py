@@ -0,0 +1,88 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from posts.counters import find_inconsistencies
+from posts.models import AuthorStats, Group, Post, User
+from posts.tests import const
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        cls.group2 = Group.objects.create(
+            title=const.STR_GROUP2_TITLE,
+            slug=const.STR_GROUP2_SLUG,
+            description=const.STR_GROUP2_DESCRIPTION,
+        )
+
+    def assertCounts(self, author_count, group_count, group2_count):
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).posts_count,
+            author_count
+        )
+        self.group.refresh_from_db()
+        self.group2.refresh_from_db()
+        self.assertEqual(self.group.posts_count, group_count)
+        self.assertEqual(self.group2.posts_count, group2_count)
+        self.assertEqual(find_inconsistencies(), [])
+
+    def test_counters_follow_create_regroup_delete(self):
+        """Проверка: счётчики при создании, смене группы и удалении поста"""
+        post = Post.objects.create(
+            text=const.STR_TEXT, author=self.user, group=self.group
+        )
+        self.assertCounts(1, 1, 0)
+        # так сохраняет пост list_editable в админке
+        post = Post.objects.get(pk=post.pk)
+        post.group = self.group2
+        post.save()
+        self.assertCounts(1, 0, 1)
+        post.group = None
+        post.save()
+        self.assertCounts(1, 0, 0)
+        post.delete()
+        self.assertCounts(0, 0, 0)
+
+    def test_counters_follow_bulk_create(self):
+        """Проверка: счётчики учитывают bulk_create"""
+        Post.objects.bulk_create(
+            Post(text=const.STR_TEXT, author=self.user, group=self.group)
+            for _ in range(const.NUM_TOTAL_POSTS)
+        )
+        self.assertCounts(const.NUM_TOTAL_POSTS, const.NUM_TOTAL_POSTS, 0)
+
+    def test_delete_author_with_posts(self):
+        """Проверка: удаление автора с постами не ломает счётчики"""
+        author = User.objects.create_user(username=const.STR_OTHER_USER)
+        Post.objects.bulk_create(
+            Post(text=const.STR_TEXT, author=author, group=self.group)
+            for _ in range(const.NUM_COUNT_POST_THREE)
+        )
+        Post.objects.create(
+            text=const.STR_TEXT, author=self.user, group=self.group
+        )
+        author.delete()
+        self.assertFalse(AuthorStats.objects.filter(author=author).exists())
+        self.assertCounts(1, 1, 0)
+
+    def test_check_and_rebuild_commands(self):
+        """Проверка: check_post_counters находит, а rebuild чинит"""
+        Post.objects.create(
+            text=const.STR_TEXT, author=self.user, group=self.group
+        )
+        Group.objects.filter(pk=self.group.pk).update(posts_count=5)
+        AuthorStats.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('check_post_counters', stdout=StringIO())
+        call_command('rebuild_post_counters', stdout=StringIO())
+        call_command('check_post_counters', stdout=StringIO())
+        self.assertCounts(1, 1, 0)
@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.tests import const
+
+URL_INDEX_RSS = reverse('posts:index_rss')
+
+
+class SyndicationFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        cls.post = Post.objects.create(
+            text=const.STR_TEXT, author=cls.user, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_index_rss_cached(self):
+        """Проверка: повторный запрос RSS не ходит в базу"""
+        response = self.client.get(URL_INDEX_RSS)
+        self.assertEqual(
+            response['Content-Type'], 'application/rss+xml; charset=utf-8'
+        )
+        self.assertContains(response, self.post.get_absolute_url())
+        self.assertContains(response, const.STR_TEXT)
+        with self.assertNumQueries(0):
+            cached = self.client.get(URL_INDEX_RSS)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+    def test_conditional_get_and_invalidation(self):
+        """Проверка: 304 по ETag, новый пост обновляет ленту"""
+        etag = self.client.get(URL_INDEX_RSS)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                URL_INDEX_RSS, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        Post.objects.create(text='новый пост', author=self.user)
+        response = self.client.get(URL_INDEX_RSS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'новый пост')
+
+    def test_group_and_author_feeds(self):
+        """Проверка: RSS и Atom групп и авторов"""
+        urls = {
+            reverse('posts:group_rss', args=[self.group.slug]):
+                'application/rss+xml',
+            reverse('posts:group_atom', args=[self.group.slug]):
+                'application/atom+xml',
+            reverse('posts:profile_rss', args=[self.user.username]):
+                'application/rss+xml',
+            reverse('posts:profile_atom', args=[self.user.username]):
+                'application/atom+xml',
+        }
+        for url, content_type in urls.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertTrue(
+                    response['Content-Type'].startswith(content_type)
+                )
+                self.assertContains(response, self.post.get_absolute_url())
+        response = self.client.get(
+            reverse('posts:group_rss', args=['no-such-group'])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_author_link_is_absolute(self):
+        """Проверка: ссылка на автора в ленте - абсолютный адрес"""
+        response = self.client.get(
+            reverse('posts:profile_atom', args=[self.user.username])
+        )
+        profile_url = reverse('posts:profile', args=[self.user.username])
+        self.assertContains(
+            response, f'<uri>http://testserver{profile_url}</uri>'
+        )
+
+    def test_slug_moved_to_other_group(self):
+        """Проверка: slug, отданный другой группе, ведёт на её ленту"""
+        url = reverse('posts:group_rss', args=[self.group.slug])
+        self.client.get(url)
+        Group.objects.filter(pk=self.group.pk).update(slug='old-slug')
+        other = Group.objects.create(
+            title=const.STR_GROUP2_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP2_DESCRIPTION,
+        )
+        Post.objects.create(
+            text='пост другой группы', author=self.user, group=other
+        )
+        response = self.client.get(url)
+        self.assertContains(response, 'пост другой группы')
+        self.assertNotContains(response, self.post.get_absolute_url())
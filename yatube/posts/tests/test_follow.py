@@ -0,0 +1,151 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.counters import find_inconsistencies
+from posts.models import AuthorStats, Follow, Post, TimelineEntry, User
+from posts.tests import const
+
+
+class FollowTimelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=const.STR_USERNAME)
+        cls.reader = User.objects.create_user(
+            username=const.STR_OTHER_USER
+        )
+        cls.stranger = User.objects.create_user(username='stranger')
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def follow(self):
+        return self.reader_client.get(
+            reverse(const.URL_PROFILE_FOLLOW, args=[self.author.username])
+        )
+
+    def feed(self):
+        response = self.reader_client.get(const.URL_FOLLOW_INDEX_REV)
+        return list(response.context['page_obj'])
+
+    def test_follow_and_unfollow(self):
+        """Проверка: подписка, отписка и счётчик подписчиков"""
+        response = self.follow()
+        self.assertRedirects(
+            response,
+            reverse(const.URL_PROFILE, args=[self.author.username])
+        )
+        self.follow()
+        self.assertEqual(
+            Follow.objects.filter(user=self.reader, author=self.author)
+            .count(),
+            1
+        )
+        self.assertEqual(self.author.stats.followers_count, 1)
+        self.reader_client.get(
+            reverse(const.URL_PROFILE_UNFOLLOW, args=[self.author.username])
+        )
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).followers_count, 0
+        )
+        self.assertEqual(find_inconsistencies(), [])
+
+    def test_follower_deleted_with_account(self):
+        """Проверка: удаление подписчика уменьшает счётчик автора"""
+        self.follow()
+        follower = User.objects.create_user(username='follower')
+        Follow.objects.create(user=follower, author=self.author)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).followers_count, 2
+        )
+        follower.delete()
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).followers_count, 1
+        )
+        self.assertEqual(find_inconsistencies(), [])
+
+    def test_self_follow_forbidden(self):
+        """Проверка: на себя подписаться нельзя"""
+        client = Client()
+        client.force_login(self.author)
+        client.get(
+            reverse(const.URL_PROFILE_FOLLOW, args=[self.author.username])
+        )
+        self.assertFalse(Follow.objects.exists())
+
+    def test_new_post_fans_out_to_followers(self):
+        """Проверка: новый пост попадает только в ленты подписчиков"""
+        self.follow()
+        post = Post.objects.create(text=const.STR_TEXT, author=self.author)
+        self.assertEqual(self.feed(), [post])
+        stranger_client = Client()
+        stranger_client.force_login(self.stranger)
+        response = stranger_client.get(const.URL_FOLLOW_INDEX_REV)
+        self.assertTemplateUsed(response, const.TEMPLATE_FOLLOW)
+        self.assertEqual(len(response.context['page_obj']), 0)
+
+    @override_settings(TIMELINE_FANOUT_BATCH=2)
+    def test_fan_out_in_batches_and_bulk_create(self):
+        """Проверка: раскладка пачками и для bulk_create"""
+        followers = [
+            User.objects.create_user(username=f'follower{number}')
+            for number in range(5)
+        ]
+        Follow.objects.bulk_create(
+            Follow(user=user, author=self.author) for user in followers
+        )
+        posts = Post.objects.bulk_create(
+            Post(text=const.STR_TEXT, author=self.author)
+            for _ in range(const.NUM_COUNT_POST_THREE)
+        )
+        self.assertTrue(all(post.pk for post in posts))
+        self.assertEqual(
+            TimelineEntry.objects.count(),
+            len(followers) * const.NUM_COUNT_POST_THREE
+        )
+
+    def test_follow_backfills_and_unfollow_clears(self):
+        """Проверка: при подписке старые посты переносятся в ленту"""
+        Post.objects.bulk_create(
+            Post(text=const.STR_TEXT, author=self.author)
+            for _ in range(const.NUM_TOTAL_POSTS)
+        )
+        self.follow()
+        self.assertEqual(len(self.feed()), const.NUM_COUNT_POST_TEN)
+        self.reader_client.get(
+            reverse(const.URL_PROFILE_UNFOLLOW, args=[self.author.username])
+        )
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), [])
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=0)
+    def test_celebrity_posts_are_pulled(self):
+        """Проверка: посты популярного автора лента читает сама"""
+        self.follow()
+        post = Post.objects.create(text=const.STR_TEXT, author=self.author)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), [post])
+
+    def test_feed_query_budget(self):
+        """Проверка: лента подписок не зависит от числа авторов"""
+        self.follow()
+        Post.objects.create(text=const.STR_TEXT, author=self.author)
+        for number in range(const.NUM_COUNT_POST_THREE):
+            author = User.objects.create_user(username=f'author{number}')
+            self.reader_client.get(
+                reverse(const.URL_PROFILE_FOLLOW, args=[author.username])
+            )
+            Post.objects.create(text=const.STR_TEXT, author=author)
+        # подписки-исключения, COUNT, страница: сессия и пользователь
+        # берутся из кэша
+        with self.assertNumQueries(3):
+            self.reader_client.get(const.URL_FOLLOW_INDEX_REV)
+
+    def test_follow_index_requires_login(self):
+        """Проверка: лента подписок только для авторизованных"""
+        response = Client().get(const.URL_FOLLOW_INDEX_REV)
+        self.assertEqual(response.status_code, 302)
@@ -1,6 +1,6 @@
 from django.test import TestCase
 
-from posts.models import Group, Post, User
+from posts.models import EXCERPT_LENGTH, Group, Post, User, make_excerpt
 from posts.tests import const
 
 
@@ -28,3 +28,36 @@ class PostModelTest(TestCase):
         for key, value in fields_posts_group.items():
             with self.subTest():
                 self.assertEqual(key, value)
+
+    def test_excerpt_follows_text(self):
+        """Проверка: превью пересчитывается при save и bulk_create"""
+        long_text = 'слово ' * 1000
+        post = Post.objects.create(author=self.user, text=long_text)
+        self.assertLessEqual(len(post.excerpt), EXCERPT_LENGTH)
+        self.assertTrue(long_text.startswith(post.excerpt[:-1]))
+        post.text = const.STR_TEXT
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, const.STR_TEXT)
+        bulk_post, = Post.objects.bulk_create(
+            [Post(author=self.user, text=long_text)]
+        )
+        self.assertEqual(
+            Post.objects.get(pk=bulk_post.pk).excerpt, make_excerpt(long_text)
+        )
+
+    def test_feed_defers_text(self):
+        """Проверка: ленты не загружают полный текст поста"""
+        post = Post.objects.feed().get(pk=self.post.pk)
+        self.assertIn('text', post.get_deferred_fields())
+        self.assertEqual(post.excerpt, const.STR_TEXT)
+
+    def test_text_html_follows_text(self):
+        """Проверка: HTML поста экранирован и обновляется при правке"""
+        post = Post.objects.create(author=self.user, text='<i>раз</i>')
+        self.assertEqual(post.text_html, '<p>&lt;i&gt;раз&lt;/i&gt;</p>')
+        post.text = 'два\nтри'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, '<p>два<br>три</p>')
+        self.assertEqual(post.excerpt_html, post.text_html)
@@ -0,0 +1,167 @@
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.middleware import REPLICA_STICKY_COOKIE, ReplicaRoutingMiddleware
+from core.models import Task
+from posts import estimates
+from posts.models import Group, Post, User
+from posts.tests import const
+from posts.utils import ELLIPSIS, elided_page_range
+
+TEMPLATE_PAGINATOR = 'posts/includes/paginator.html'
+# больше элементов сокращённый пагинатор не выводит ни при каком числе
+# страниц: Первая, Предыдущая, 9 номеров, Следующая, Последняя
+MAX_PAGINATOR_ITEMS = 13
+
+
+def render_paginator(num_pages, number):
+    page_obj = Paginator(range(num_pages), 1).get_page(number)
+    return render_to_string(TEMPLATE_PAGINATOR, {'page_obj': page_obj})
+
+
+class ElidedPaginatorTest(TestCase):
+    def test_elided_page_range(self):
+        """Проверка: окно вокруг текущей страницы и края"""
+        self.assertEqual(list(elided_page_range(3, 5)), [1, 2, 3, 4, 5])
+        self.assertEqual(
+            list(elided_page_range(50, 100)),
+            [1, ELLIPSIS, 48, 49, 50, 51, 52, ELLIPSIS, 100]
+        )
+        self.assertEqual(
+            list(elided_page_range(1, 100)),
+            [1, 2, 3, ELLIPSIS, 100]
+        )
+        self.assertEqual(
+            list(elided_page_range(100, 100)),
+            [1, ELLIPSIS, 98, 99, 100]
+        )
+
+    def test_render_size_does_not_grow(self):
+        """Проверка: число ссылок и запросов не зависит от числа страниц"""
+        items = {}
+        for num_pages in (100, 1000000):
+            # с полным page_range здесь был бы миллион ссылок
+            with self.assertNumQueries(0):
+                html = render_paginator(num_pages, num_pages // 2)
+            items[num_pages] = html.count('page-item')
+            self.assertLessEqual(items[num_pages], MAX_PAGINATOR_ITEMS)
+            self.assertIn(f'?page={num_pages}', html)
+        self.assertEqual(items[1000000], items[100])
+
+
+class FeedCountTestMixin:
+    def count_queries(self, url=const.URL_INDEX_REV):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest.get(url)
+        return response, [
+            query['sql'] for query in queries if 'COUNT(' in query['sql']
+        ]
+
+
+class CachedCountTest(FeedCountTestMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        Post.objects.bulk_create(
+            Post(text=const.STR_TEXT, author=cls.user)
+            for _ in range(const.NUM_TOTAL_POSTS)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest = Client()
+
+    def test_count_cached_until_feed_changes(self):
+        """Проверка: COUNT(*) ленты считается заново только после записи"""
+        _, counts = self.count_queries()
+        self.assertEqual(len(counts), 1)
+        response, counts = self.count_queries()
+        self.assertEqual(counts, [])
+        self.assertEqual(
+            response.context['page_obj'].paginator.count,
+            const.NUM_TOTAL_POSTS
+        )
+        Post.objects.create(text=const.STR_TEXT, author=self.user)
+        response, counts = self.count_queries()
+        self.assertEqual(len(counts), 1)
+        self.assertEqual(
+            response.context['page_obj'].paginator.count,
+            const.NUM_TOTAL_POSTS + 1
+        )
+
+
+@override_settings(POSTS_APPROXIMATE_COUNT_THRESHOLD=const.NUM_TOTAL_POSTS)
+class ApproximateCountTest(FeedCountTestMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        Post.objects.bulk_create(
+            Post(text=const.STR_TEXT, author=cls.user, group=cls.group)
+            for _ in range(const.NUM_TOTAL_POSTS)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest = Client()
+
+    def test_feeds_use_estimates_above_threshold(self):
+        """Проверка: выше порога лента обходится без COUNT(*)"""
+        for url in (
+            const.URL_INDEX_REV,
+            reverse(const.URL_GROUP_LIST, args=[const.STR_GROUP1_SLUG]),
+            const.URL_PROFILE_REV,
+        ):
+            with self.subTest(url=url):
+                response, counts = self.count_queries(url)
+                self.assertEqual(counts, [])
+                paginator = response.context['page_obj'].paginator
+                self.assertTrue(paginator.approximate)
+                self.assertContains(response, 'около 2 стр.')
+
+    @override_settings(POSTS_APPROXIMATE_COUNT_THRESHOLD=1000)
+    def test_exact_below_threshold(self):
+        """Проверка: ниже порога число страниц точное"""
+        response, counts = self.count_queries()
+        self.assertEqual(len(counts), 1)
+        self.assertNotContains(response, 'около')
+
+    def test_stale_estimate_refreshed_in_background(self):
+        """Проверка: устаревшая оценка отдаётся и пересчитывается задачей"""
+        cache.set(estimates.ESTIMATE_KEY, (1000, 0), None)
+        self.assertEqual(estimates.post_count_estimate(), 1000)
+        # задачи в тестах выполняются сразу (TASKS_EAGER)
+        self.assertEqual(
+            estimates.post_count_estimate(), const.NUM_TOTAL_POSTS
+        )
+
+    @override_settings(TASKS_EAGER=False, DATABASE_REPLICAS=['replica'])
+    def test_stale_estimate_single_task_not_sticky(self):
+        """Проверка: одна задача пересчёта, читатель остаётся на реплике"""
+        cache.set(estimates.ESTIMATE_KEY, (1000, 0), None)
+
+        def view(request):
+            return HttpResponse(estimates.post_count_estimate())
+
+        middleware = ReplicaRoutingMiddleware(view)
+        for _ in range(2):
+            response = middleware(RequestFactory().get('/'))
+            self.assertNotIn(REPLICA_STICKY_COOKIE, response.cookies)
+        self.assertEqual(
+            Task.objects.filter(
+                name='posts.tasks.refresh_post_count_estimate'
+            ).count(),
+            1
+        )
@@ -0,0 +1,109 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.search import DATABASE_BACKEND, get_backend
+from posts.tests import const
+
+URL_SEARCH = reverse('posts:post_search')
+STR_WORD = 'котики'
+STR_OTHER_WORD = 'собаки'
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.other_user = User.objects.create_user(
+            username=const.STR_OTHER_USER
+        )
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f'{STR_WORD} {number_post}',
+                author=cls.user,
+                group=cls.group if number_post % 2 else None,
+            )
+            for number_post in range(const.NUM_TOTAL_POSTS)
+        ]
+        cls.other_post = Post.objects.create(
+            text=f'{STR_WORD} {STR_WORD} {STR_OTHER_WORD}',
+            author=cls.other_user,
+        )
+
+    def setUp(self):
+        self.guest = Client()
+
+    def search(self, **params):
+        return self.guest.get(URL_SEARCH, params).context['page_obj']
+
+    def test_search_ranked_and_paginated(self):
+        """Проверка: поиск ранжирует совпадения и листается курсором"""
+        first = self.search(q=STR_WORD)
+        self.assertEqual(len(first), const.NUM_COUNT_POST_TEN)
+        self.assertEqual(first[0], self.other_post)
+        second = self.search(q=STR_WORD, cursor=first.next_cursor)
+        self.assertEqual(len(second), const.NUM_COUNT_POST_THREE + 1)
+        self.assertFalse(second.has_next())
+        self.assertEqual(
+            len(set(first) | set(second)), const.NUM_TOTAL_POSTS + 1
+        )
+
+    def test_search_filters(self):
+        """Проверка: фильтры поиска по группе и автору"""
+        by_group = self.search(q=STR_WORD, group=self.group.slug)
+        self.assertTrue(all(post.group == self.group for post in by_group))
+        by_author = self.search(
+            q=STR_WORD, author=const.STR_OTHER_USER
+        )
+        self.assertEqual(list(by_author), [self.other_post])
+
+    def test_index_follows_edit_delete_bulk_create(self):
+        """Проверка: индекс обновляется при правке, удалении и bulk_create"""
+        post = Post.objects.get(pk=self.posts[0].pk)
+        post.text = STR_OTHER_WORD
+        post.save()
+        self.assertIn(post, self.search(q=STR_OTHER_WORD))
+        post.delete()
+        self.assertEqual(len(self.search(q=STR_OTHER_WORD)), 1)
+        Post.objects.bulk_create([
+            Post(text='пакетная запись', author=self.user)
+        ])
+        self.assertEqual(len(self.search(q='пакетная')), 1)
+
+    def test_rebuild_search_index(self):
+        """Проверка: rebuild_search_index восстанавливает индекс"""
+        get_backend().clear()
+        self.assertEqual(len(self.search(q=STR_OTHER_WORD)), 0)
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(list(self.search(q=STR_OTHER_WORD)), [
+            self.other_post
+        ])
+
+    def test_admin_search_uses_index(self):
+        """Проверка: поиск в админке идёт через поисковый бэкенд"""
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.guest.force_login(admin)
+        response = self.guest.get(
+            reverse('admin:posts_post_changelist'), {'q': STR_OTHER_WORD}
+        )
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.other_post]
+        )
+
+    @override_settings(POSTS_SEARCH_BACKEND=DATABASE_BACKEND)
+    def test_database_backend(self):
+        """Проверка: запасной бэкенд без FTS находит те же посты"""
+        self.assertEqual(
+            list(self.search(q=STR_OTHER_WORD)), [self.other_post]
+        )
@@ -0,0 +1,85 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from posts import thumbnails
+from posts.models import Post, User
+from posts.tests import const
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(name='big.png', size=(1600, 900)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'teal').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostThumbnailTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_upload_generates_thumbnails(self):
+        """Проверка: картинка из формы получает миниатюры в фоне"""
+        self.authorized_client.post(
+            const.URL_POST_CREATE_REV,
+            data={'text': const.STR_TEXT, 'image': make_image()}
+        )
+        post = Post.objects.get()
+        self.assertTrue(post.image.name.startswith('posts/'))
+        feed = thumbnails.lookup(post.image, 'feed')
+        detail = thumbnails.lookup(post.image, 'detail')
+        self.assertEqual((feed.width, feed.height), (960, 339))
+        self.assertEqual(detail.width, 1200)
+        response = self.authorized_client.get(const.URL_INDEX_REV)
+        self.assertContains(response, feed.url)
+        response = self.authorized_client.get(
+            reverse(const.URL_POST_DETAIL, args=[post.pk])
+        )
+        self.assertContains(response, detail.url)
+
+    @override_settings(TASKS_EAGER=False)
+    def test_feed_never_resizes_inline(self):
+        """Проверка: без готовой миниатюры лента не ресайзит картинку"""
+        post = Post.objects.create(
+            text=const.STR_TEXT, author=self.user, image=make_image()
+        )
+        response = self.authorized_client.get(const.URL_INDEX_REV)
+        self.assertContains(response, post.image.url)
+        self.assertIsNone(thumbnails.lookup(post.image, 'feed'))
+
+    @override_settings(TASKS_EAGER=False)
+    def test_command_generates_in_bulk(self):
+        """Проверка: generate_thumbnails готовит миниатюры всех постов"""
+        posts = Post.objects.bulk_create(
+            Post(text=const.STR_TEXT, author=self.user, image=make_image())
+            for _ in range(const.NUM_COUNT_POST_THREE)
+        )
+        out = StringIO()
+        call_command(
+            'generate_thumbnails', '--processes', '0', '--chunk', '2',
+            stdout=out
+        )
+        self.assertIn(str(const.NUM_COUNT_POST_THREE), out.getvalue())
+        for post in posts:
+            self.assertIsNotNone(thumbnails.lookup(post.image, 'feed'))
@@ -1,7 +1,11 @@
-from django.test import Client, TestCase
+import base64
+import json
+
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from posts.tests import const
+from posts.tests.utils import QueryBudgetMixin
 from posts.models import Group, Post, User
 
 
@@ -156,3 +160,128 @@ class PaginatorViewsTest(TestCase):
                     )
                     posts = len(response.context['page_obj'])
                     self.assertEqual(posts, count_posts)
+
+
+@override_settings(POSTS_PAGINATION='cursor')
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        cls.GROUP_LIST = reverse(
+            const.URL_GROUP_LIST,
+            kwargs={'slug': cls.group.slug}
+        )
+        Post.objects.bulk_create(
+            Post(
+                text=f'{const.STR_TEXT} {number_post}',
+                author=cls.user,
+                group=cls.group,
+            )
+            for number_post in range(const.NUM_TOTAL_POSTS)
+        )
+
+    def setUp(self):
+        self.guest = Client()
+
+    def test_cursor_pages_index_group_list_profile(self):
+        """Проверка: курсорный пагинатор на index, group_list, profile"""
+        for reverse_name in (
+            const.URL_INDEX_HOME, self.GROUP_LIST, const.URL_PROFILE_REV
+        ):
+            with self.subTest(reverse_name=reverse_name):
+                first = self.guest.get(reverse_name).context['page_obj']
+                self.assertEqual(len(first), const.NUM_COUNT_POST_TEN)
+                self.assertFalse(first.has_previous())
+                second = self.guest.get(
+                    reverse_name, {'cursor': first.next_cursor}
+                ).context['page_obj']
+                self.assertEqual(len(second), const.NUM_COUNT_POST_THREE)
+                self.assertFalse(second.has_next())
+                back = self.guest.get(
+                    reverse_name, {'cursor': second.previous_cursor}
+                ).context['page_obj']
+                self.assertEqual(list(back), list(first))
+                self.assertEqual(
+                    len(set(first) | set(second)), const.NUM_TOTAL_POSTS
+                )
+
+    def test_cursor_invalid_token_first_page(self):
+        """Проверка: битый курсор отдаёт первую страницу"""
+        response = self.guest.get(const.URL_INDEX_HOME, {'cursor': 'bad'})
+        page_obj = response.context['page_obj']
+        self.assertEqual(len(page_obj), const.NUM_COUNT_POST_TEN)
+        self.assertFalse(page_obj.has_previous())
+
+    def test_cursor_pk_out_of_range_first_page(self):
+        """Проверка: курсор с pk вне BIGINT отдаёт первую страницу"""
+        cursor = base64.urlsafe_b64encode(json.dumps(
+            ['n', '9999-12-31T23:59:59', 10 ** 30]
+        ).encode()).decode()
+        for url in (const.URL_INDEX_HOME, reverse('api:post_list')):
+            with self.subTest(url=url):
+                response = self.guest.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 200)
+        page_obj = self.guest.get(
+            const.URL_INDEX_HOME, {'cursor': cursor}
+        ).context['page_obj']
+        self.assertEqual(len(page_obj), const.NUM_COUNT_POST_TEN)
+        self.assertFalse(page_obj.has_previous())
+
+
+class FeedQueryBudgetTest(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=const.STR_USERNAME)
+        cls.group = Group.objects.create(
+            title=const.STR_GROUP1_TITLE,
+            slug=const.STR_GROUP1_SLUG,
+            description=const.STR_GROUP1_DESCRIPTION,
+        )
+        # у каждого поста свой автор и своя группа: худший случай для N+1
+        for number_post in range(const.NUM_TOTAL_POSTS):
+            Post.objects.create(
+                text=f'{const.STR_TEXT} {number_post}',
+                author=User.objects.create_user(
+                    username=f'{const.STR_OTHER_USER}{number_post}'
+                ),
+                group=Group.objects.create(
+                    title=f'{const.STR_GROUP2_TITLE}{number_post}',
+                    slug=f'{const.STR_GROUP2_SLUG}{number_post}',
+                    description=const.STR_GROUP2_DESCRIPTION,
+                ),
+            )
+        cls.post = Post.objects.create(
+            text=const.STR_TEXT,
+            author=cls.user,
+            group=cls.group,
+        )
+        cls.GROUP_LIST = reverse(
+            const.URL_GROUP_LIST,
+            kwargs={'slug': cls.group.slug}
+        )
+        cls.POST_DETAIL = reverse(
+            const.URL_POST_DETAIL,
+            kwargs={'post_id': cls.post.pk}
+        )
+
+    def setUp(self):
+        self.guest = Client()
+
+    def test_feed_pages_query_budget(self):
+        """Проверка: число SQL-запросов лент не зависит от числа постов"""
+        budgets = (
+            (const.URL_INDEX_HOME, const.QUERY_BUDGET_INDEX),
+            (self.GROUP_LIST, const.QUERY_BUDGET_GROUP_LIST),
+            (const.URL_PROFILE_REV, const.QUERY_BUDGET_PROFILE),
+            (self.POST_DETAIL, const.QUERY_BUDGET_POST_DETAIL),
+        )
+        for url, budget in budgets:
+            with self.subTest(url=url):
+                self.assertQueryBudget(self.guest, url, budget)
@@ -0,0 +1,21 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """Миксин для TestCase: проверка бюджета SQL-запросов страницы."""
+
+    def assertQueryBudget(self, client, url, budget):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertLessEqual(
+            len(queries),
+            budget,
+            '{} выполнила {} запросов при бюджете {}:\n{}'.format(
+                url,
+                len(queries),
+                budget,
+                '\n'.join(query['sql'] for query in queries),
+            )
+        )
+        return response
@@ -0,0 +1,65 @@
+from django.conf import settings
+from sorl.thumbnail import default
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as sorl_defaults
+from sorl.thumbnail.conf import settings as sorl_settings
+from sorl.thumbnail.images import ImageFile
+
+
+class PostThumbnailBackend(ThumbnailBackend):
+    """Бэкенд sorl-thumbnail, который умеет только искать готовое.
+
+    get_thumbnail() при промахе KV-хранилища читает исходник и
+    ресайзит его прямо в запросе. lookup() ищет миниатюру по тому же
+    ключу, что и get_thumbnail(), и при промахе возвращает None.
+    """
+
+    def thumbnail_options(self, options):
+        options = dict(options)
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        # так же, как в get_thumbnail(): иначе имя файла не совпадёт
+        for key, attr in self.extra_options:
+            value = getattr(sorl_settings, attr)
+            if value != getattr(sorl_defaults, attr):
+                options.setdefault(key, value)
+        return options
+
+    def lookup(self, file_, geometry_string, **options):
+        source = ImageFile(file_)
+        if sorl_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        name = self._get_thumbnail_filename(
+            source, geometry_string, self.thumbnail_options(options)
+        )
+        return default.kvstore.get(ImageFile(name, default.storage))
+
+
+backend = PostThumbnailBackend()
+
+
+def size_spec(size):
+    """(геометрия, опции sorl) размера из POSTS_THUMBNAIL_SIZES."""
+    spec = settings.POSTS_THUMBNAIL_SIZES[size]
+    return spec['geometry'], {
+        key: value for key, value in spec.items() if key != 'geometry'
+    }
+
+
+def lookup(image, size):
+    """Готовая миниатюра картинки или None, без обращения к файлу."""
+    if not image:
+        return None
+    geometry, options = size_spec(size)
+    return backend.lookup(image, geometry, **options)
+
+
+def generate(image):
+    """Создаёт миниатюры всех размеров и кладёт их в KV-хранилище."""
+    if not image:
+        return []
+    thumbnails = []
+    for size in settings.POSTS_THUMBNAIL_SIZES:
+        geometry, options = size_spec(size)
+        thumbnails.append(backend.get_thumbnail(image, geometry, **options))
+    return thumbnails
@@ -0,0 +1,122 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from .models import AuthorStats, Follow, Post, TimelineEntry
+
+
+def is_celebrity(author_id):
+    """Авторов с большим числом подписчиков не разносим по лентам:
+    их посты лента подписчика подтягивает сама при чтении."""
+    followers_count = AuthorStats.objects.filter(
+        author_id=author_id
+    ).values_list('followers_count', flat=True).first()
+    return (followers_count or 0) > settings.TIMELINE_FANOUT_LIMIT
+
+
+def write_entries(entries):
+    TimelineEntry.objects.bulk_create(
+        entries,
+        batch_size=settings.TIMELINE_FANOUT_BATCH,
+        ignore_conflicts=True
+    )
+
+
+def fan_out(posts):
+    """Раскладывает новые посты по лентам подписчиков их авторов.
+
+    Подписчики читаются по ключу и записываются пачками по
+    TIMELINE_FANOUT_BATCH, так что у автора с тысячами подписчиков
+    не растёт память процесса.
+    """
+    by_author = defaultdict(list)
+    for post in posts:
+        if post.pk is not None:
+            by_author[post.author_id].append(post)
+    for author_id, author_posts in by_author.items():
+        if is_celebrity(author_id):
+            continue
+        followers = Follow.objects.filter(
+            author_id=author_id
+        ).order_by('user_id').values_list('user_id', flat=True)
+        last_user_id = 0
+        while True:
+            batch = list(
+                followers.filter(user_id__gt=last_user_id)[
+                    :settings.TIMELINE_FANOUT_BATCH
+                ]
+            )
+            if not batch:
+                break
+            last_user_id = batch[-1]
+            write_entries(
+                TimelineEntry(
+                    user_id=user_id, post_id=post.pk, pub_date=post.pub_date
+                )
+                for user_id in batch
+                for post in author_posts
+            )
+
+
+def follow(user, author):
+    """Подписка с переносом последних постов автора в ленту.
+
+    Возвращает False, если подписка уже была или это сам пользователь.
+    """
+    if user == author:
+        return False
+    try:
+        with transaction.atomic():
+            Follow.objects.create(user=user, author=author)
+    except IntegrityError:
+        return False
+    if not is_celebrity(author.pk):
+        recent = author.posts.order_by('-pub_date', '-id').values_list(
+            'pk', 'pub_date'
+        )[:settings.TIMELINE_BACKFILL]
+        write_entries(
+            TimelineEntry(user=user, post_id=pk, pub_date=pub_date)
+            for pk, pub_date in recent
+        )
+    return True
+
+
+def unfollow(user, author):
+    deleted, _ = Follow.objects.filter(user=user, author=author).delete()
+    if not deleted:
+        return False
+    TimelineEntry.objects.filter(
+        user=user,
+        post__in=author.posts.values('pk')
+    ).delete()
+    return True
+
+
+def feed_for(user):
+    """Посты ленты подписок, новые сверху.
+
+    Обычно это проход по индексу timeline_user_idx. Если среди подписок
+    есть авторы выше TIMELINE_FANOUT_LIMIT, их посты добавляются
+    условием по автору, и сортировать приходится уже по постам.
+    """
+    celebrities = list(
+        Follow.objects.filter(
+            user=user,
+            author__stats__followers_count__gt=settings.TIMELINE_FANOUT_LIMIT
+        ).values_list('author_id', flat=True)
+    )
+    if not celebrities:
+        return Post.objects.feed().filter(
+            timeline_entries__user=user
+        ).order_by(
+            '-timeline_entries__pub_date',
+            # выражение, а не строка: иначе Django развернёт FK
+            # в Meta.ordering поста
+            F('timeline_entries__post').desc()
+        )
+    return Post.objects.feed().filter(
+        Q(pk__in=TimelineEntry.objects.filter(user=user).values('post'))
+        | Q(author__in=celebrities)
+    )
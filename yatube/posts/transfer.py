@@ -0,0 +1,122 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Group, Post, User
+
+FORMAT_JSONL = 'jsonl'
+FORMAT_CSV = 'csv'
+FORMATS = (FORMAT_JSONL, FORMAT_CSV)
+FIELDS = ('text', 'pub_date', 'author', 'group')
+
+
+def export_rows(chunk_size=2000):
+    """Посты как словари FIELDS, без загрузки всей таблицы в память."""
+    rows = Post.objects.order_by('pk').values_list(
+        'text', 'pub_date', 'author__username', 'group__slug'
+    )
+    for text, pub_date, author, group in rows.iterator(chunk_size):
+        yield {
+            'text': text,
+            'pub_date': pub_date.isoformat(),
+            'author': author,
+            'group': group or '',
+        }
+
+
+def write_rows(rows, stream, file_format):
+    """Пишет строки в поток по одной; возвращает их число."""
+    total = 0
+    if file_format == FORMAT_CSV:
+        writer = csv.DictWriter(stream, FIELDS)
+        writer.writeheader()
+        for total, row in enumerate(rows, 1):
+            writer.writerow(row)
+        return total
+    for total, row in enumerate(rows, 1):
+        stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+    return total
+
+
+def read_rows(stream, file_format):
+    if file_format == FORMAT_CSV:
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # битая строка пропускается, как и строка с ошибкой в полях
+            yield None
+
+
+class LookupCache:
+    """username/slug -> id; промахи тоже запоминаются."""
+
+    def __init__(self, queryset, field):
+        self.queryset = queryset
+        self.field = field
+        self.cache = {}
+
+    def get(self, value):
+        if not value:
+            return None
+        if value not in self.cache:
+            self.cache[value] = self.queryset.filter(
+                **{self.field: value}
+            ).values_list('pk', flat=True).first()
+        return self.cache[value]
+
+
+def parse_row(row, authors, groups):
+    """Post из строки файла или None, если строку импортировать нельзя."""
+    if not isinstance(row, dict):
+        return None
+    author_id = authors.get(row.get('author'))
+    if author_id is None or not row.get('text'):
+        return None
+    pub_date = timezone.now()
+    if row.get('pub_date'):
+        try:
+            pub_date = parse_datetime(str(row['pub_date']))
+        except ValueError:
+            # формат верный, но дата невозможная, например 13-й месяц
+            return None
+        if pub_date is None:
+            return None
+        if timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+    return Post(
+        text=row['text'],
+        pub_date=pub_date,
+        author_id=author_id,
+        group_id=groups.get(row.get('group')),
+    )
+
+
+def import_rows(rows, batch_size=1000):
+    """Вставляет посты пачками по batch_size, каждая в своей транзакции.
+
+    После каждой пачки отдаёт (вставлено, пропущено) для прогресса.
+    """
+    authors = LookupCache(User.objects.all(), 'username')
+    groups = LookupCache(Group.objects.all(), 'slug')
+    created = skipped = 0
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+        batch = [parse_row(row, authors, groups) for row in chunk]
+        batch = [post for post in batch if post is not None]
+        skipped += len(chunk) - len(batch)
+        with transaction.atomic():
+            Post.objects.bulk_create(batch, keep_pub_date=True)
+        created += len(batch)
+        yield created, skipped
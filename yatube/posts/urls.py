@@ -1,5 +1,5 @@
 from django.urls import path
-from posts import views
+from posts import feeds, views
 
 app_name = 'posts'
 
@@ -10,4 +10,34 @@ urlpatterns = [
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path('search/', views.post_search, name='post_search'),
+    path('rss/', feeds.LatestPostsFeed(), name='index_rss'),
+    path('atom/', feeds.LatestPostsAtomFeed(), name='index_atom'),
+    path('group/<slug:slug>/rss/', feeds.GroupPostsFeed(), name='group_rss'),
+    path(
+        'group/<slug:slug>/atom/',
+        feeds.GroupPostsAtomFeed(),
+        name='group_atom'
+    ),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.AuthorPostsFeed(),
+        name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.AuthorPostsAtomFeed(),
+        name='profile_atom'
+    ),
+    path('follow/', views.follow_index, name='follow_index'),
+    path(
+        'profile/<str:username>/follow/',
+        views.profile_follow,
+        name='profile_follow'
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        views.profile_unfollow,
+        name='profile_unfollow'
+    ),
 ]
@@ -1,8 +1,242 @@
+import base64
+import binascii
+import json
+
 from django.conf import settings
 from django.core.paginator import Paginator
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from . import feed_cache
+
+PAGINATION_PAGES = 'pages'
+PAGINATION_CURSOR = 'cursor'
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+# больший pk база не примет: OverflowError вместо первой страницы
+MAX_CURSOR_PK = 2 ** 63 - 1
+
+# пропуск в сокращённом списке страниц
+ELLIPSIS = '…'
+
+
+class CursorPage:
+    """Страница курсорной пагинации: вместо номера - токены соседних
+    страниц."""
+    is_cursor = True
+
+    def __init__(self, object_list, cursor, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<CursorPage {}>'.format(self.cursor or 'first')
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по (pub_date, pk) без COUNT(*) и OFFSET.
+
+    Каждая страница - это диапазонный запрос от последней записи
+    предыдущей страницы, поэтому время выборки не зависит от глубины.
+    """
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    @staticmethod
+    def position(obj):
+        """(pub_date, pk) записи, от которой строится курсор."""
+        return obj.pub_date, obj.pk
+
+    def encode_cursor(self, obj, direction):
+        pub_date, pk = self.position(obj)
+        payload = [direction, pub_date.isoformat(), pk]
+        return base64.urlsafe_b64encode(
+            json.dumps(payload).encode()
+        ).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Возвращает (direction, pub_date, pk) или None для
+        битого токена."""
+        try:
+            direction, pub_date, pk = json.loads(
+                base64.urlsafe_b64decode(cursor.encode())
+            )
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (binascii.Error, TypeError, ValueError, AttributeError):
+            return None
+        if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or not pub_date:
+            return None
+        if not 1 <= pk <= MAX_CURSOR_PK:
+            return None
+        return direction, pub_date, pk
+
+    def window(self, direction, pub_date, pk):
+        """Запрос per_page + 1 записей по одну сторону от курсора.
+
+        Условие по pub_date вынесено отдельно от тай-брейка по pk, чтобы
+        база делала поиск по диапазону индекса, а не сканировала его.
+        """
+        if direction == CURSOR_NEXT:
+            queryset = self.object_list.filter(
+                pub_date__lte=pub_date
+            ).exclude(
+                pub_date=pub_date, pk__gte=pk
+            ).order_by('-pub_date', '-pk')
+        else:
+            queryset = self.object_list.filter(
+                pub_date__gte=pub_date
+            ).exclude(
+                pub_date=pub_date, pk__lte=pk
+            ).order_by('pub_date', 'pk')
+        return queryset[:self.per_page + 1]
+
+    def get_page(self, cursor):
+        """Как Paginator.get_page: невалидный курсор - первая страница."""
+        decoded = self.decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            cursor = None
+            rows = list(
+                self.object_list.order_by('-pub_date', '-pk')[
+                    :self.per_page + 1
+                ]
+            )
+            has_next, has_previous = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+        else:
+            direction = decoded[0]
+            rows = list(self.window(*decoded))
+            if direction == CURSOR_NEXT:
+                has_next, has_previous = len(rows) > self.per_page, True
+                rows = rows[:self.per_page]
+            else:
+                has_next, has_previous = True, len(rows) > self.per_page
+                rows = rows[:self.per_page][::-1]
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1], CURSOR_NEXT)
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(rows[0], CURSOR_PREVIOUS)
+        return CursorPage(rows, cursor, next_cursor, previous_cursor)
+
+
+class ValuesCursorPaginator(CursorPaginator):
+    """CursorPaginator для строк values(): в них нужны pub_date и id."""
+
+    @staticmethod
+    def position(row):
+        return row['pub_date'], row['id']
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который берёт COUNT(*) ленты из кэша.
+
+    Число постов хранится под текущей версией ленты feed_key, поэтому
+    запись в ленту сама делает его устаревшим.
+    """
+
+    def __init__(self, object_list, per_page, feed_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.feed_key = feed_key
+
+    @cached_property
+    def count(self):
+        return feed_cache.get_count(
+            self.feed_key,
+            lambda: super(CachedCountPaginator, self).count
+        )
+
+
+class ApproximateCountPaginator(CachedCountPaginator):
+    """Выше threshold постов число страниц - оценка, а не COUNT(*).
+
+    estimate() возвращает оценку числа постов без тяжёлого запроса;
+    ниже порога (или без оценки) считается точно, как у родителя.
+    """
+    approximate = False
+
+    def __init__(self, object_list, per_page, feed_key, estimate, threshold,
+                 **kwargs):
+        super().__init__(object_list, per_page, feed_key, **kwargs)
+        self.estimate = estimate
+        self.threshold = threshold
+
+    @cached_property
+    def count(self):
+        estimate = self.estimate()
+        if estimate is not None and estimate >= self.threshold:
+            self.approximate = True
+            return estimate
+        return super().count
+
+
+def elided_page_range(number, num_pages, on_each_side=2, on_ends=1):
+    """Номера страниц вокруг текущей и по краям, пропуски - ELLIPSIS.
+
+    Длина списка не зависит от числа страниц: не больше
+    2 * (on_each_side + on_ends) + 3 элементов.
+    """
+    if num_pages <= (on_each_side + on_ends) * 2 + 1:
+        yield from range(1, num_pages + 1)
+        return
+    if number > on_each_side + on_ends + 2:
+        yield from range(1, on_ends + 1)
+        yield ELLIPSIS
+        yield from range(number - on_each_side, number + 1)
+    else:
+        yield from range(1, number + 1)
+    if number < num_pages - on_each_side - on_ends - 1:
+        yield from range(number + 1, number + on_each_side + 1)
+        yield ELLIPSIS
+        yield from range(num_pages - on_ends + 1, num_pages + 1)
+    else:
+        yield from range(number + 1, num_pages + 1)
+
 
+def paginator_obj(request, post_list, feed_key=None, estimate=None):
+    """Страница ленты; с feed_key число постов берётся из кэша ленты.
 
-def paginator_obj(request, post_list):
-    paginator = Paginator(post_list, settings.LIMIT_POSTS_TEN)
+    estimate - функция без аргументов с оценкой числа постов, её берёт
+    пагинатор при POSTS_APPROXIMATE_COUNT_THRESHOLD.
+    """
+    if settings.POSTS_PAGINATION == PAGINATION_CURSOR:
+        paginator = CursorPaginator(post_list, settings.LIMIT_POSTS_TEN)
+        return paginator.get_page(request.GET.get('cursor'))
+    threshold = settings.POSTS_APPROXIMATE_COUNT_THRESHOLD
+    if feed_key is None:
+        paginator = Paginator(post_list, settings.LIMIT_POSTS_TEN)
+    elif estimate is not None and threshold is not None:
+        paginator = ApproximateCountPaginator(
+            post_list, settings.LIMIT_POSTS_TEN, feed_key, estimate,
+            threshold
+        )
+    else:
+        paginator = CachedCountPaginator(
+            post_list, settings.LIMIT_POSTS_TEN, feed_key
+        )
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
@@ -1,57 +1,150 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 
-from .forms import PostForm
-from .models import Group, Post, User
+from . import conditional, estimates, feed_cache, thumbnails, timeline
+from .forms import PostForm, SearchForm
+from .models import Follow, Group, Post, User
+from .search import search_page
 from .utils import paginator_obj
 
 
 def index(request):
-    post_list = Post.objects.all()
-    page_obj = paginator_obj(request, post_list)
-    return render(
+    feed_key = feed_cache.INDEX
+    etag = conditional.feed_etag(request, feed_key)
+    response = conditional.not_modified(request, etag)
+    if response:
+        return response
+    post_list = Post.objects.feed()
+    page_obj = paginator_obj(
+        request, post_list, feed_key, estimates.post_count_estimate
+    )
+    response = render(
         request,
         'posts/index.html',
-        {'page_obj': page_obj}
+        {'page_obj': page_obj, 'feed_key': feed_key}
     )
+    return conditional.set_validators(response, etag)
 
 
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
-    page_obj = paginator_obj(request, post_list)
-    return render(
+    feed_key = feed_cache.group_key(group.pk)
+    etag = conditional.feed_etag(
+        request, feed_key, group.title, group.description
+    )
+    response = conditional.not_modified(request, etag)
+    if response:
+        return response
+    post_list = group.posts.feed()
+    # денормализованный счётчик группы уже загружен вместе с ней
+    page_obj = paginator_obj(
+        request, post_list, feed_key, lambda: group.posts_count
+    )
+    response = render(
         request,
         'posts/group_list.html',
-        {'group': group, 'page_obj': page_obj}
+        {'group': group, 'page_obj': page_obj, 'feed_key': feed_key}
     )
+    return conditional.set_validators(response, etag)
 
 
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    post_list = author.posts.all()
-    page_obj = paginator_obj(request, post_list)
-    return render(
+    author = get_object_or_404(
+        User.objects.select_related('stats'),
+        username=username
+    )
+    feed_key = feed_cache.author_key(author.pk)
+    # кнопку подписки в ETag представляет версия пары из кэша: 304
+    # отдаётся без запроса Follow
+    follow_version = ''
+    if request.user.is_authenticated:
+        follow_version = feed_cache.get_version(
+            feed_cache.follow_key(request.user.pk, author.pk)
+        )
+    etag = conditional.feed_etag(
+        request, feed_key, author.username, author.get_full_name(),
+        follow_version
+    )
+    response = conditional.not_modified(request, etag)
+    if response:
+        return response
+    following = (
+        request.user.is_authenticated
+        and Follow.objects.filter(user=request.user, author=author).exists()
+    )
+    post_list = author.posts.feed()
+    page_obj = paginator_obj(
+        request, post_list, feed_key,
+        lambda: getattr(author, 'stats', None) and author.stats.posts_count
+    )
+    response = render(
         request,
         'posts/profile.html', {
             'page_obj': page_obj,
-            'author': author
+            'author': author,
+            'following': following,
+            'feed_key': feed_key
         }
     )
+    return conditional.set_validators(response, etag)
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    return render(
+    post = get_object_or_404(
+        Post.objects.with_related().select_related('author__stats'),
+        pk=post_id
+    )
+    # только поиск готовой миниатюры: ресайз делает generate_thumbnails
+    thumbnail = thumbnails.lookup(post.image, 'detail')
+    etag = conditional.post_etag(
+        request, post, thumbnail.name if thumbnail else ''
+    )
+    # Last-Modified не знает о входе пользователя: только для гостей
+    last_modified = None
+    if not request.user.is_authenticated:
+        last_modified = conditional.post_last_modified(post)
+    response = conditional.not_modified(request, etag, last_modified)
+    if response:
+        return response
+    response = render(
         request,
         'posts/post_detail.html',
-        {'post': post}
+        {'post': post, 'thumbnail': thumbnail}
+    )
+    return conditional.set_validators(response, etag, last_modified)
+
+
+def post_search(request):
+    form = SearchForm(request.GET or None)
+    page_obj = None
+    if form.is_valid():
+        group = form.cleaned_data['group']
+        author = form.cleaned_data['author']
+        page_obj = search_page(
+            form.cleaned_data['q'],
+            settings.LIMIT_POSTS_TEN,
+            request.GET.get('cursor'),
+            group_id=group.pk if group else None,
+            author_id=author.pk if author else None
+        )
+    # ссылки пагинатора должны сохранять запрос и фильтры
+    query = request.GET.copy()
+    query.pop('cursor', None)
+    return render(
+        request,
+        'posts/search.html',
+        {
+            'form': form,
+            'page_obj': page_obj,
+            'query_string': query.urlencode() + '&' if query else ''
+        }
     )
 
 
 @login_required
 def post_create(request):
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
@@ -71,7 +164,9 @@ def post_edit(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
     if post.author != request.user:
         return redirect('posts:post_detail', post.pk)
-    form = PostForm(request.POST or None, instance=post)
+    form = PostForm(
+        request.POST or None, files=request.FILES or None, instance=post
+    )
     if form.is_valid():
         post = form.save()
         return redirect('posts:post_detail', post.pk)
@@ -80,3 +175,27 @@ def post_edit(request, post_id):
         "posts/create_post.html",
         {'form': form, "is_edit": True}
     )
+
+
+@login_required
+def follow_index(request):
+    page_obj = paginator_obj(request, timeline.feed_for(request.user))
+    return render(
+        request,
+        'posts/follow.html',
+        {'page_obj': page_obj}
+    )
+
+
+@login_required
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    timeline.follow(request.user, author)
+    return redirect('posts:profile', username)
+
+
+@login_required
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    timeline.unfollow(request.user, author)
+    return redirect('posts:profile', username)
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_KEY = 'auth-user:{}'
+
+
+def user_key(user_id):
+    return USER_KEY.format(user_id)
+
+
+def forget_user(user_id):
+    cache.delete(user_key(user_id))
+
+
+def forget_users(user_ids):
+    cache.delete_many([user_key(user_id) for user_id in user_ids])
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт request.user из кэша.
+
+    AuthenticationMiddleware вызывает get_user() на каждый запрос
+    вошедшего пользователя. Запись сбрасывается при сохранении и
+    удалении пользователя (в том числе при смене пароля) и при выходе,
+    см. users.signals.
+
+    QuerySet.update() сигналов не шлёт: после
+    User.objects.filter(...).update(is_active=False) старая запись
+    живёт до AUTH_USER_CACHE_TIMEOUT, если не вызвать forget_users()
+    с id изменённых пользователей.
+    """
+
+    def get_user(self, user_id):
+        key = user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
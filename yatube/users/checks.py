@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+LOCAL_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+CACHED_SESSIONS = 'django.contrib.sessions.backends.cached_db'
+CACHED_BACKEND = 'users.backends.CachedModelBackend'
+
+
+@register(Tags.security, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Сессии и пользователи в кэше требуют кэша, общего для процессов.
+
+    С LocMemCache выход и смена пароля сбрасывают запись только в одном
+    процессе, а остальные до AUTH_USER_CACHE_TIMEOUT и
+    SESSION_COOKIE_AGE пускают по старой сессии.
+    """
+    cached = (
+        settings.SESSION_ENGINE == CACHED_SESSIONS
+        or CACHED_BACKEND in settings.AUTHENTICATION_BACKENDS
+    )
+    if cached and settings.CACHES['default']['BACKEND'] == LOCAL_CACHE:
+        return [Warning(
+            'Сессии и request.user кэшируются в LocMemCache процесса',
+            hint='Задайте CACHE_BACKEND и CACHE_LOCATION общего кэша '
+                 '(memcached, redis)',
+            id='users.W001',
+        )]
+    return []
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+
+LEGACY_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+CACHED_BACKEND = 'users.backends.CachedModelBackend'
+
+
+class LegacySessionBackendMiddleware:
+    """Переводит сессии ModelBackend на CachedModelBackend.
+
+    Бэкенд входа записан в самой сессии, и AuthenticationMiddleware
+    разлогинивает, если его нет в AUTHENTICATION_BACKENDS. Оставлять там
+    ModelBackend ради старых сессий дорого: он тоже проверяет пароль, и
+    неудачный вход считал бы хэш дважды. Сессия переписывается один раз,
+    при первом запросе после перехода.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        backends = settings.AUTHENTICATION_BACKENDS
+        if (
+            LEGACY_BACKEND not in backends
+            and CACHED_BACKEND in backends
+            and request.session.get(BACKEND_SESSION_KEY) == LEGACY_BACKEND
+        ):
+            request.session[BACKEND_SESSION_KEY] = CACHED_BACKEND
+        return self.get_response(request)
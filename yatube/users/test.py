@@ -1,6 +1,15 @@
+from unittest import mock
+
+from django.contrib.auth import BACKEND_SESSION_KEY, get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 
+from users.backends import forget_users, user_key
+
+User = get_user_model()
+
 
 class PostsViewsTests(TestCase):
     @classmethod
@@ -28,3 +37,83 @@ class PostsViewsTests(TestCase):
             with self.subTest(reverse_name=reverse_name):
                 response = self.guest_client.get(reverse_name)
                 self.assertTemplateUsed(response, template)
+
+
+class CachedAuthTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='cached_user', password='old-Passw0rd'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.login(username='cached_user', password='old-Passw0rd')
+        self.url = reverse('about:author')
+
+    def test_session_and_user_from_cache(self):
+        """Проверка: вошедший пользователь не стоит запросов к базе"""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_password_change_invalidates_user(self):
+        """Проверка: после смены пароля чужие сессии разлогинены"""
+        other = Client()
+        other.login(username='cached_user', password='old-Passw0rd')
+        other.get(self.url)
+        response = self.client.post(reverse('users:password_change_form'), {
+            'old_password': 'old-Passw0rd',
+            'new_password1': 'new-Passw0rd',
+            'new_password2': 'new-Passw0rd',
+        })
+        self.assertRedirects(response, reverse('users:password_change_done'))
+        self.assertTrue(
+            self.client.get(self.url).wsgi_request.user.is_authenticated
+        )
+        self.assertFalse(
+            other.get(self.url).wsgi_request.user.is_authenticated
+        )
+
+    def test_logout_forgets_user(self):
+        """Проверка: выход убирает пользователя из кэша"""
+        self.client.get(self.url)
+        self.assertIsNotNone(cache.get(user_key(self.user.pk)))
+        self.client.get(reverse('users:logout'))
+        self.assertIsNone(cache.get(user_key(self.user.pk)))
+
+    def test_session_with_model_backend_still_valid(self):
+        """Проверка: сессии, открытые через ModelBackend, не сбрасываются"""
+        old = Client()
+        old.force_login(
+            self.user, backend='django.contrib.auth.backends.ModelBackend'
+        )
+        self.assertTrue(old.get(self.url).wsgi_request.user.is_authenticated)
+        self.assertEqual(
+            old.session[BACKEND_SESSION_KEY],
+            'users.backends.CachedModelBackend'
+        )
+
+    def test_failed_login_hashes_once(self):
+        """Проверка: неудачный вход считает хэш пароля один раз"""
+        encode = PBKDF2PasswordHasher.encode
+        with mock.patch.object(
+            PBKDF2PasswordHasher, 'encode', autospec=True,
+            side_effect=encode
+        ) as patched:
+            self.assertFalse(
+                Client().login(username='nobody', password='old-Passw0rd')
+            )
+        self.assertEqual(patched.call_count, 1)
+
+    def test_forget_users_after_update(self):
+        """Проверка: forget_users сбрасывает кэш после QuerySet.update()"""
+        self.client.get(self.url)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        forget_users([self.user.pk])
+        self.assertFalse(
+            self.client.get(self.url).wsgi_request.user.is_authenticated
+        )
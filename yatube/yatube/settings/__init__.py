@@ -0,0 +1,19 @@
+"""Настройки yatube: профиль выбирается переменной окружения DJANGO_ENV.
+
+dev (по умолчанию) - разработка и тесты, prod - продакшен,
+bench - замеры manage.py benchmark_views на отдельной базе.
+Каждый профиль можно указать и напрямую:
+DJANGO_SETTINGS_MODULE=yatube.settings.prod.
+"""
+import os
+
+DJANGO_ENV = os.getenv('DJANGO_ENV', 'dev')
+
+if DJANGO_ENV == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif DJANGO_ENV == 'bench':
+    from .bench import *  # noqa: F401,F403
+elif DJANGO_ENV == 'dev':
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ImportError(f'Неизвестный профиль DJANGO_ENV={DJANGO_ENV}')
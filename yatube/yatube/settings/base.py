@@ -0,0 +1,316 @@
+"""
+Django settings for yatube project: общие для всех профилей.
+
+Профиль выбирает переменная окружения DJANGO_ENV, см. __init__.py.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# константа для лимита вывода постов на страницу(константа для views.py)
+LIMIT_POSTS_TEN = 10
+LIMIT_POSTS_THREE = 3
+# режим пагинации лент index, group_list, profile:
+# 'pages' - номера страниц (?page=), 'cursor' - курсоры (?cursor=)
+POSTS_PAGINATION = 'pages'
+# бэкенд поиска по постам (dotted path); None - FTS5 на SQLite,
+# иначе posts.search.DatabaseSearchBackend
+POSTS_SEARCH_BACKEND = None
+# сколько лучших совпадений поиска показывать в админке
+POSTS_ADMIN_SEARCH_LIMIT = 1000
+# лента подписок: посты раскладываются по лентам подписчиков пачками
+# по TIMELINE_FANOUT_BATCH строк; авторов, у которых подписчиков больше
+# TIMELINE_FANOUT_LIMIT, лента подтягивает при чтении
+TIMELINE_FANOUT_BATCH = 1000
+TIMELINE_FANOUT_LIMIT = 10000
+# сколько последних постов автора попадает в ленту при подписке
+TIMELINE_BACKFILL = 100
+# фоновые задачи core.tasks: при TASKS_EAGER выполняются сразу в
+# запросе, иначе их выполняет воркер manage.py run_tasks
+TASKS_EAGER = os.getenv('TASKS_EAGER', '1') == '1'
+TASKS_MAX_ATTEMPTS = 3
+# задержка перед повтором в секундах, удваивается с каждой попыткой
+TASKS_RETRY_DELAY = 30
+# задачи running дольше стольких секунд считаются брошенными
+TASKS_STALE_AFTER = 60 * 10
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv(
+    'SECRET_KEY', '*7!0=haava2bkkqm(0q_8=770cv0abq8-bf207*q2ycahf*7)-'
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = os.getenv('DEBUG', '0') == '1'
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
+if os.getenv('ALLOWED_HOSTS'):
+    ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS').split(',')
+
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:index'
+
+# сессия читается из кэша, в базу - только при промахе и записи
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+# request.user тоже из кэша, см. users.backends; сессии, открытые до
+# перехода через ModelBackend, переписывает users.middleware
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+AUTH_USER_CACHE_TIMEOUT = 60 * 15
+# LOGOUT_REDIRECT_URL = 'posts:index'
+# Application definition
+
+#  подключаем движок filebased.EmailBackend
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# указываем директорию, в которую будут складываться файлы писем
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+
+INSTALLED_APPS = [
+    'about.apps.AboutConfig',
+    'core.apps.CoreConfig',
+    'users.apps.UsersConfig',
+    'posts.apps.PostsConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'sorl.thumbnail',
+]
+
+MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'users.middleware.LegacySessionBackendMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+
+TEMPLATES = [
+    {
+        'BACKEND': 'core.template_backends.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+# доля запросов, для которых RequestMetricsMiddleware снимает метрики
+# (заголовок Server-Timing и строка в лог yatube.requests), от 0 до 1
+REQUEST_METRICS_SAMPLE_RATE = float(
+    os.getenv('REQUEST_METRICS_SAMPLE_RATE', '1')
+)
+
+# строки метрик запросов (JSON) и ошибки фоновых задач пишутся в stderr,
+# откуда их забирает сборщик логов; уровень yatube.requests можно поднять
+# до WARNING, чтобы выключить метрики в логе, не трогая Server-Timing
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+        'verbose': {'format': '%(asctime)s %(levelname)s %(name)s '
+                              '%(message)s'},
+    },
+    'handlers': {
+        'requests': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'message',
+        },
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'verbose',
+        },
+    },
+    'loggers': {
+        'yatube.requests': {
+            'handlers': ['requests'],
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        'yatube.tasks': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': os.getenv('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+        'USER': os.getenv('DB_USER', ''),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+        # сколько секунд держать соединение между запросами; 0 - новое
+        # соединение на каждый запрос
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0')),
+        # проверять живость переиспользуемого соединения в начале запроса
+        # (core.db.check_connections)
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# реплики только для чтения: DB_REPLICAS=/path/r1.sqlite3,/path/r2.sqlite3
+# (с SQLite их обновляет manage.py sync_replicas). Тесты запускаются
+# без DB_REPLICAS; если реплики заданы, в тестовой БД они зеркалят default
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1
+):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+# сколько секунд после своей записи пользователь читает из default
+REPLICA_STICKY_SECONDS = 10
+
+# PRAGMA для каждого нового соединения с SQLite (core.db): WAL пускает
+# читателей параллельно с записью, synchronous=NORMAL в режиме WAL
+# не теряет целостность, busy_timeout ждёт блокировку вместо ошибки
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+# LocMemCache у каждого процесса свой: годится только для разработки и
+# тестов. prod по умолчанию берёт FileBasedCache, общий для воркеров
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# время жизни закэшированных страниц лент, сек.
+FEED_CACHE_TIMEOUT = 60 * 15
+# сколько последних постов отдают RSS/Atom-ленты posts.feeds
+SYNDICATION_ITEMS = 20
+# с какого числа постов пагинатор лент показывает оценку ("около N
+# страниц") вместо точного COUNT(*); None - всегда считать точно
+POSTS_APPROXIMATE_COUNT_THRESHOLD = None
+# как часто пересчитывать оценку числа постов общей ленты, сек.
+POSTS_COUNT_ESTIMATE_TIMEOUT = 60 * 10
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+STATIC_URL = '/static/'
+STATIC_ROOT = os.getenv('STATIC_ROOT', os.path.join(BASE_DIR, 'static_root'))
+# расширения, для которых collectstatic пишет .gz/.br (core.storage)
+STATIC_COMPRESS_EXTENSIONS = (
+    '.css', '.js', '.svg', '.ico', '.txt', '.json', '.map', '.html', '.xml',
+)
+# сжатая копия пишется, только если экономит хотя бы эту долю размера
+STATIC_COMPRESS_MIN_RATIO = 0.05
+# отдавать статику через core.views.serve_static (без nginx перед Django)
+STATIC_SERVE = False
+# Cache-Control для файлов с хэшем в имени и для остальных, секунд
+STATIC_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_UNHASHED_MAX_AGE = 60
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
+# sorl-thumbnail помнит готовые миниатюры в таблице thumbnail_kvstore,
+# читая её через кэш: шаблоны лент не открывают файлы картинок
+THUMBNAIL_KVSTORE = 'sorl.thumbnail.kvstores.cached_db_kvstore.KVStore'
+# размеры миниатюр постов: geometry и опции sorl get_thumbnail
+POSTS_THUMBNAIL_SIZES = {
+    'feed': {'geometry': '960x339', 'crop': 'center'},
+    'detail': {'geometry': '1200', 'upscale': False},
+}
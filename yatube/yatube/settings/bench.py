@@ -0,0 +1,21 @@
+"""Профиль для замеров: как prod, но на отдельной базе bench.sqlite3
+и с побочными эффектами постов прямо в запросе, без воркера."""
+import copy
+import os
+
+from .base import BASE_DIR
+from .prod import *  # noqa: F401,F403
+from .prod import CACHES, DATABASES
+
+DATABASES = copy.deepcopy(DATABASES)
+DATABASES['default']['NAME'] = os.getenv(
+    'DB_NAME', os.path.join(BASE_DIR, 'bench.sqlite3')
+)
+# свой каталог кэша: версии лент bench.sqlite3 не смешиваются с prod
+CACHES = copy.deepcopy(CACHES)
+CACHES['default']['LOCATION'] = os.getenv(
+    'CACHE_LOCATION', os.path.join(BASE_DIR, 'bench_cache')
+)
+
+TASKS_EAGER = True
+TEMPLATES_PREWARM = False
@@ -0,0 +1,15 @@
+"""Профиль для разработки и тестов."""
+import copy
+import os
+import sys
+
+from .base import *  # noqa: F401,F403
+from .base import LOGGING
+
+DEBUG = os.getenv('DEBUG', '1') == '1'
+
+if sys.argv[1:2] == ['test'] and 'REQUEST_LOG_LEVEL' not in os.environ:
+    # строка метрик на каждый запрос тестового клиента забивает вывод
+    # manage.py test; assertLogs перехватывает логгер и так
+    LOGGING = copy.deepcopy(LOGGING)
+    LOGGING['loggers']['yatube.requests']['level'] = 'WARNING'
@@ -0,0 +1,52 @@
+"""Профиль для продакшена."""
+import copy
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, TEMPLATES
+
+# соединение с БД живёт между запросами, core.db проверяет его живость
+DATABASES = copy.deepcopy(DATABASES)
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+
+# версии лент, счётчики, сессии и пользователи должны быть общими для
+# всех процессов: иначе запись в одном воркере не сбросит кэш других.
+# Для memcached - CACHE_BACKEND=...memcached.MemcachedCache и адрес
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION', os.path.join(BASE_DIR, 'django_cache')
+        ),
+    }
+}
+
+# побочные эффекты постов выполняет воркер manage.py run_tasks
+TASKS_EAGER = os.getenv('TASKS_EAGER', '0') == '1'
+
+# шаблоны читаются и разбираются один раз на процесс. loaders заданы
+# явно, поэтому APP_DIRS выключен: Django не допускает их вместе
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# wsgi.py разбирает все шаблоны при старте процесса (warm_templates)
+TEMPLATES_PREWARM = os.getenv('TEMPLATES_PREWARM', '1') == '1'
+
+# большие ленты не считают COUNT(*) на каждый запрос
+POSTS_APPROXIMATE_COUNT_THRESHOLD = int(
+    os.getenv('POSTS_APPROXIMATE_COUNT_THRESHOLD', '10000')
+)
+
+# имена статики с хэшем содержимого и заранее сжатые .gz/.br копии
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+STATIC_SERVE = os.getenv('STATIC_SERVE', '1') == '1'
@@ -1,10 +1,25 @@
+import re
+
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from core.views import serve_static
 
 urlpatterns = [
     path('auth/', include('users.urls')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
+    path('api/v1/', include('posts.api_urls', namespace='api')),
     path('', include('posts.urls', namespace='posts')),
     path('admin/', admin.site.urls),
 ]
+# загруженные картинки постов; static() работает только при DEBUG
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.STATIC_SERVE:
+    static_prefix = re.escape(settings.STATIC_URL.lstrip('/'))
+    urlpatterns.append(
+        re_path(rf'^{static_prefix}(?P<path>.+)$', serve_static)
+    )
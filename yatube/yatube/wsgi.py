@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+if getattr(settings, 'TEMPLATES_PREWARM', False):
+    # первый запрос после деплоя не должен разбирать шаблоны
+    from core.prewarm import warm_templates
+
+    warm_templates()